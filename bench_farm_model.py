@@ -0,0 +1,248 @@
+"""Memory and allocation benchmark of the active-jobs table.
+
+Compares the dict rows that collect_job_data used to rebuild every cycle
+with the persistent FarmModel, on a synthetic farm. For each approach it
+records the time per cycle, the peak memory allocated during a cycle, the
+memory kept between cycles and the garbage collections triggered, and
+writes everything as JSON.
+
+    python bench_farm_model.py --jobs 20 --tasks 2500 --cycles 30 -o bench.json
+
+Memory is measured with tracemalloc, so timings are slower than in
+production; compare them with each other only.
+"""
+import argparse
+import atexit
+import gc
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Keep the monitor from patching this process or touching real caches
+os.environ.setdefault("MONITOR_RUNTIME", "asgi")
+os.environ["PARSE_WORKERS"] = "0"
+_cache_dir = tempfile.mkdtemp(prefix="bench-farm-model-")
+atexit.register(shutil.rmtree, _cache_dir, True)
+os.environ["LOG_CACHE_DIR"] = os.path.join(_cache_dir, "logs")
+os.environ["PREVIEW_CACHE_DIR"] = os.path.join(_cache_dir, "previews")
+
+import flamenco_monitor as fm  # noqa: E402
+
+
+# ---- Synthetic Manager data -------------------------------------------------
+
+def make_cycle(n_jobs, n_tasks, active_per_job, cycle):
+    """Manager responses for one poll, as freshly decoded JSON.
+
+    Tasks finish in order, active_per_job at a time, one more per cycle.
+    """
+    jobs = [{"id": f"job-{j:05d}", "name": f"shot{j:03d}", "status": "active"} for j in range(n_jobs)]
+    task_lists = []
+    for j in range(n_jobs):
+        done = min(cycle, n_tasks)
+        tasks = []
+        for i in range(n_tasks):
+            status = "completed" if i < done else "active" if i < done + active_per_job else "queued"
+            tasks.append({
+                "id": f"task-{j:05d}-{i:06d}",
+                "name": f"render-{i * 10 + 1}-{i * 10 + 10}",
+                "status": status,
+                "task_type": "blender",
+                "worker": {"id": f"worker-{i % 64:03d}"} if status != "queued" else None,
+            })
+        task_lists.append(tasks)
+    return jobs, task_lists
+
+
+def log_results(pending_logs, cycle):
+    # What fetch_render_progress_and_step returns, built fresh like the
+    # unpickled results from the parse workers
+    return [(cycle % 16, 16, int(cycle % 16 * 100 / 16), f"{cycle % 16} / 16",
+             time.strftime("%Y-%m-%d %H:%M:%S"), "Rendering " + "Tiles",
+             f"Rendering tile {cycle % 16} of 16", "00:10.00") for _ in pending_logs]
+
+
+# ---- The two approaches -----------------------------------------------------
+
+# build_active_jobs and apply_log_results as they were before FarmModel
+def legacy_build_active_jobs(jobs, task_lists, looked_up_workers):
+    jobs_display = []
+    pending_logs = []
+    task_samples = {}
+    for job, tasks in zip(jobs, task_lists):
+        job_id = job.get("id")
+        job_name = job.get("name", "-")
+        n_tasks = len(tasks)
+        n_tasks_completed = 0
+        tasks_display = []
+        for t in tasks:
+            task_id = t.get("id")
+            task_type = t.get("task_type") or t.get("type")
+            task_name = t.get("name") or task_type or task_id
+            task_status = t.get("status", "-").capitalize()
+            log_url = fm.get_proxy_log_url(job_id, task_id)
+            if t.get("status") == "completed":
+                progress_pct = 100
+                progress_text = "Completed"
+                n_tasks_completed += 1
+                last_log_time = ""
+                step_label = "Finished"
+                tile_info = ""
+                time_remaining = ""
+            elif t.get("status") == "failed":
+                progress_pct = 100
+                progress_text = "Failed"
+                n_tasks_completed += 1
+                last_log_time = ""
+                step_label = "Failed"
+                tile_info = ""
+                time_remaining = ""
+            else:
+                progress_pct = 0
+                # Filled in from the log later, if the task type has a parser
+                progress_text = task_status
+                last_log_time = ""
+                step_label = ""
+                tile_info = ""
+                time_remaining = ""
+            task_display = {
+                "task_id": task_id,
+                "task_name": task_name,
+                "status": task_status,
+                "progress_pct": progress_pct,
+                "progress_text": progress_text,
+                "log_url": log_url,
+                "last_log_time": last_log_time or "",
+                "step_label": step_label,
+                "tile_info": tile_info,
+                "time_remaining": time_remaining,
+            }
+            worker_id = fm.task_worker_id(t) or looked_up_workers.get(task_id)
+            task_samples[task_id] = [t.get("status"), worker_id, None]
+            parser = fm.get_progress_parser(task_type, t.get("status"))
+            if parser is not None:
+                pending_logs.append((task_display, (job_id, task_id, parser, task_name)))
+            elif t.get("status") in ("completed", "failed"):
+                fm.log_cache.mark_finished(job_id, task_id)
+            tasks_display.append(task_display)
+        job_progress_pct = int((n_tasks_completed / n_tasks) * 100) if n_tasks > 0 else 0
+        jobs_display.append({
+            "job_id": job_id,
+            "job_name": job_name,
+            "job_progress_pct": job_progress_pct,
+            "job_status": job.get("status", "-").capitalize(),
+            "tasks": tasks_display,
+            "n_tasks": n_tasks,
+            "n_tasks_completed": n_tasks_completed
+        })
+    return jobs_display, pending_logs, task_samples
+
+
+def legacy_apply_log_results(pending_logs, log_results, task_samples):
+    for (task_display, _), result in zip(pending_logs, log_results):
+        cur, total, pct, progress, last_log_time, step_label, tile_info, time_remaining = result
+        task_display.update({
+            "progress_pct": pct,
+            "progress_text": progress,
+            "last_log_time": last_log_time or "",
+            "step_label": step_label,
+            "tile_info": tile_info,
+            "time_remaining": time_remaining,
+        })
+        if tile_info:
+            task_samples[task_display["task_id"]][2] = cur
+
+
+def dict_cycle(jobs, task_lists, cycle, state):
+    jobs_display, pending_logs, task_samples = legacy_build_active_jobs(jobs, task_lists, {})
+    legacy_apply_log_results(pending_logs, log_results(pending_logs, cycle), task_samples)
+    payload = json.dumps({"jobs": jobs_display}, separators=(",", ":")).encode()
+    # latest_data kept the last rows alive until the next cycle
+    state["latest"] = jobs_display
+    return len(payload)
+
+
+def model_cycle(jobs, task_lists, cycle, state):
+    pending_logs, _, task_samples = state["farm"].update(jobs, task_lists, {})
+    fm.apply_log_results(pending_logs, log_results(pending_logs, cycle), task_samples)
+    return len(fm.encode_update({"jobs": state["farm"]}))
+
+
+APPROACHES = {"dicts": (dict_cycle, dict), "farm_model": (model_cycle, lambda: {"farm": fm.FarmModel()})}
+
+
+def run(name, args):
+    cycle_fn, make_state = APPROACHES[name]
+    state = make_state()
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    collections = [0, 0, 0]
+    elapsed, peaks, payload_bytes = [], [], 0
+    for cycle in range(args.cycles):
+        jobs, task_lists = make_cycle(args.jobs, args.tasks, args.active, cycle)
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        gc_before = [s["collections"] for s in gc.get_stats()]
+        started = time.perf_counter()
+        payload_bytes = cycle_fn(jobs, task_lists, cycle, state)
+        elapsed.append(time.perf_counter() - started)
+        for gen, stats in enumerate(gc.get_stats()):
+            collections[gen] += stats["collections"] - gc_before[gen]
+        peaks.append(tracemalloc.get_traced_memory()[1] - before)
+        del jobs, task_lists
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    # The first cycle builds everything from scratch for both approaches
+    steady = elapsed[1:] or elapsed
+    steady_peaks = peaks[1:] or peaks
+    return {
+        "approach": name,
+        "first_cycle_ms": round(elapsed[0] * 1000, 2),
+        "cycle_ms_mean": round(sum(steady) / len(steady) * 1000, 2),
+        "cycle_peak_kb_mean": round(sum(steady_peaks) / len(steady_peaks) / 1024, 1),
+        "cycle_peak_kb_max": round(max(peaks) / 1024, 1),
+        "retained_kb": round(retained / 1024, 1),
+        # Collections triggered while building and serializing the rows
+        "gc_collections": dict(zip(("gen0", "gen1", "gen2"), collections)),
+        "payload_bytes": payload_bytes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--jobs", type=int, default=10, help="synthetic active jobs")
+    parser.add_argument("--tasks", type=int, default=2000, help="tasks per job")
+    parser.add_argument("--active", type=int, default=4, help="active tasks per job")
+    parser.add_argument("--cycles", type=int, default=20, help="update cycles per approach")
+    parser.add_argument("-o", "--output", help="write JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    results = []
+    for name in APPROACHES:
+        result = run(name, args)
+        print(f"{name:10}: {result['cycle_ms_mean']} ms/cycle, peak {result['cycle_peak_kb_mean']} KB/cycle, "
+              f"retained {result['retained_kb']} KB, gen0 collections {result['gc_collections']['gen0']}",
+              file=sys.stderr)
+        results.append(result)
+
+    report = {
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        "host": {"cpus": os.cpu_count(), "python": sys.version.split()[0]},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
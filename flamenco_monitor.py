@@ -1,19 +1,75 @@
-import eventlet
-eventlet.monkey_patch()
+import os
+
+# "eventlet" (default) serves Flask-SocketIO from eventlet's green threads;
+# "asgi" serves python-socketio's ASGI app from uvicorn on asyncio.
+MONITOR_RUNTIME = os.environ.get("MONITOR_RUNTIME", "eventlet").lower()
+# Spawned parse workers re-import the main module as "__mp_main__". They
+# only run parse_workers, so start-up work with side effects (patching,
+# scanning and evicting the caches, compressing assets) is skipped there.
+IN_PARSE_WORKER = __name__ == "__mp_main__"
+if MONITOR_RUNTIME == "eventlet":
+    import eventlet
+    if not IN_PARSE_WORKER:
+        eventlet.monkey_patch()
+    import eventlet.event
 
+import asyncio
+import gzip
+import hashlib
+import heapq
+import json
+import mimetypes
+import multiprocessing
 import requests
 import re
-import os
-from flask import Flask, render_template_string
-from flask_socketio import SocketIO, emit
+import mmap
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from flask import Flask, Response, abort, jsonify, request
 from datetime import datetime, timezone
+try:
+    import brotli
+except ImportError:
+    brotli = None
+if MONITOR_RUNTIME == "asgi":
+    import httpx
+    import socketio as python_socketio
+    from a2wsgi import WSGIMiddleware
+else:
+    from flask_socketio import SocketIO
+
+from parse_workers import (
+    Image,
+    LOG_INDEX_MAX_LINES_PER_TOKEN,
+    TOKEN_RE,
+    get_progress_parser,
+    make_thumbnail,
+    parse_log_file,
+    tokenize_log_file,
+)
 
 FLAMENCO_SERVER = os.environ.get("FLAMENCO_SERVER", "localhost:9080")
 FLAMENCO_API_URL = f"http://{FLAMENCO_SERVER}/api/v3"
 FLAMENCO_JOBFILES_URL_ROOT = f"http://{FLAMENCO_SERVER}/job-files"
 
+DEBUG = os.environ.get("FLASK_DEBUG", "0") == "1"
+MONITOR_HOST = os.environ.get("MONITOR_HOST", "0.0.0.0")
+MONITOR_PORT = int(os.environ.get("MONITOR_PORT", 5000))
+UPDATE_INTERVAL = float(os.environ.get("UPDATE_INTERVAL", 1))
+WSGI_THREADS = int(os.environ.get("WSGI_THREADS", 16))
+
 app = Flask(__name__)
-socketio = SocketIO(app, async_mode='eventlet', cors_allowed_origins="*")
+if MONITOR_RUNTIME == "asgi":
+    sio = python_socketio.AsyncServer(async_mode="asgi", cors_allowed_origins="*")
+else:
+    socketio = SocketIO(app, async_mode='eventlet', cors_allowed_origins="*")
 
 try:
     SERVER_TZ = datetime.now().astimezone().tzinfo
@@ -62,139 +118,750 @@ def get_jobs(statuses=["active", "queued"]):
         print("Error querying jobs:", e)
         return []
 
+def fetch_tasks(job_id):
+    response = requests.get(
+        f"{FLAMENCO_API_URL}/jobs/{job_id}/tasks",
+        timeout=5
+    )
+    response.raise_for_status()
+    return response.json().get("tasks", [])
+
 def get_tasks(job_id):
+    try:
+        return fetch_tasks(job_id)
+    except Exception as e:
+        print(f"Error querying tasks for job {job_id}:", e)
+        return []
+
+def get_task(task_id):
+    try:
+        response = requests.get(
+            f"{FLAMENCO_API_URL}/tasks/{task_id}",
+            timeout=5
+        )
+        response.raise_for_status()
+        return response.json()
+    except Exception as e:
+        print(f"Error querying task {task_id}:", e)
+        return None
+
+def get_job(job_id):
     try:
         response = requests.get(
-            f"{FLAMENCO_API_URL}/jobs/{job_id}/tasks",
+            f"{FLAMENCO_API_URL}/jobs/{job_id}",
             timeout=5
         )
         response.raise_for_status()
+        return response.json()
+    except Exception as e:
+        print(f"Error querying job {job_id}:", e)
+        return None
+
+# asyncio counterparts of the fetchers above, used by the asgi runtime.
+# The client's base_url is FLAMENCO_API_URL.
+async def aget_farm_status(client):
+    try:
+        resp = await client.get("/status", timeout=3)
+        resp.raise_for_status()
+        return resp.json().get('status', 'unknown')
+    except Exception as e:
+        print(f"Error querying farm status: {e}")
+        return 'unavailable'
+
+async def aget_workers(client):
+    try:
+        resp = await client.get("/worker-mgt/workers", timeout=3)
+        resp.raise_for_status()
+        return resp.json().get('workers', [])
+    except Exception as e:
+        print(f"Error querying workers: {e}")
+        return []
+
+async def aget_jobs(client, statuses=["active", "queued"]):
+    try:
+        response = await client.post("/jobs/query", json={"status_in": statuses}, timeout=5)
+        response.raise_for_status()
+        return response.json().get("jobs", [])
+    except Exception as e:
+        print("Error querying jobs:", e)
+        return []
+
+async def aget_tasks(client, job_id):
+    try:
+        response = await client.get(f"/jobs/{job_id}/tasks", timeout=5)
+        response.raise_for_status()
         return response.json().get("tasks", [])
     except Exception as e:
         print(f"Error querying tasks for job {job_id}:", e)
         return []
 
+async def aget_task(client, task_id):
+    try:
+        response = await client.get(f"/tasks/{task_id}", timeout=5)
+        response.raise_for_status()
+        return response.json()
+    except Exception as e:
+        print(f"Error querying task {task_id}:", e)
+        return None
+
+async def aget_job(client, job_id):
+    try:
+        response = await client.get(f"/jobs/{job_id}", timeout=5)
+        response.raise_for_status()
+        return response.json()
+    except Exception as e:
+        print(f"Error querying job {job_id}:", e)
+        return None
+
+WORKER_PERF_WINDOW = int(os.environ.get("WORKER_PERF_WINDOW", 300))
+WORKER_PERF_TASKS = int(os.environ.get("WORKER_PERF_TASKS", 50))
+FAILED_TASK_STATUSES = ("failed", "soft-failed")
+
+class WorkerPerf:
+    """Streaming render aggregates for one worker.
+
+    Tile throughput covers the last WORKER_PERF_WINDOW seconds, task duration
+    and failure rate the last WORKER_PERF_TASKS finished tasks. Every sample
+    is an O(1) update; nothing is recomputed from history.
+    """
+    __slots__ = ("tile_samples", "tiles_in_window", "first_sample", "durations", "outcomes", "failures")
+
+    def __init__(self):
+        self.tile_samples = deque()
+        self.tiles_in_window = 0
+        self.first_sample = None
+        self.durations = deque(maxlen=WORKER_PERF_TASKS)
+        self.outcomes = deque()
+        self.failures = 0
+
+    def add_tiles(self, now, tiles):
+        if self.first_sample is None:
+            self.first_sample = now
+        if tiles:
+            self.tile_samples.append((now, tiles))
+            self.tiles_in_window += tiles
+        self._expire(now)
+
+    def add_task(self, duration, failed):
+        self.outcomes.append(failed)
+        self.failures += failed
+        if len(self.outcomes) > WORKER_PERF_TASKS:
+            self.failures -= self.outcomes.popleft()
+        if duration is not None and not failed:
+            self.durations.append(duration)
+
+    def _expire(self, now):
+        cutoff = now - WORKER_PERF_WINDOW
+        while self.tile_samples and self.tile_samples[0][0] < cutoff:
+            self.tiles_in_window -= self.tile_samples.popleft()[1]
+
+    def snapshot(self, now):
+        self._expire(now)
+        span = min(WORKER_PERF_WINDOW, now - self.first_sample) if self.first_sample is not None else 0
+        return {
+            "tiles_per_sec": round(self.tiles_in_window / span, 2) if span > 0 else None,
+            "median_task_duration": round(statistics.median(self.durations), 1) if self.durations else None,
+            "failure_rate": round(self.failures / len(self.outcomes), 3) if self.outcomes else None,
+            "tasks_sampled": len(self.outcomes),
+        }
+
+worker_perf = {}
+# task_id -> [status, worker_id, tiles, started]; "started" stays None for
+# tasks that were already running when first seen, since their real
+# start time is unknown.
+_task_tracker = {}
+
+def task_worker_id(t):
+    worker_id = (t.get("worker") or {}).get("id")
+    if worker_id:
+        return worker_id
+    # The tracked worker only holds while the task keeps running; a task
+    # that was requeued and picked up again may be on another worker.
+    tracked = _task_tracker.get(t.get("id"))
+    if tracked and tracked[0] == "active" and tracked[1]:
+        return tracked[1]
+    return None
+
+def needs_worker_lookup(t):
+    # Older Managers leave the worker out of task summaries
+    return t.get("status") == "active" and not task_worker_id(t)
+
+def record_task_sample(task_id, status, worker_id, tiles, now):
+    prev = _task_tracker.get(task_id)
+    if prev is None:
+        _task_tracker[task_id] = [status, worker_id, tiles, None]
+        if status == "active" and worker_id and tiles is not None:
+            worker_perf.setdefault(worker_id, WorkerPerf()).add_tiles(now, 0)
+        return
+    prev_status, prev_worker, prev_tiles, started = prev
+    if prev_status == "active":
+        worker_id = worker_id or prev_worker
+    if status == "active":
+        if prev_status != "active":
+            started = now
+            prev_tiles = None
+        if worker_id and tiles is not None:
+            # The tile counter restarts with every frame of a multi-frame task
+            delta = tiles - prev_tiles if prev_tiles is not None and tiles >= prev_tiles else tiles
+            worker_perf.setdefault(worker_id, WorkerPerf()).add_tiles(now, delta)
+    elif prev_status == "active" and worker_id and (status == "completed" or status in FAILED_TASK_STATUSES):
+        duration = now - started if started is not None else None
+        worker_perf.setdefault(worker_id, WorkerPerf()).add_task(duration, status in FAILED_TASK_STATUSES)
+    _task_tracker[task_id] = [status, worker_id, tiles if status == "active" else None, started]
+
+def record_task_samples(task_samples, now):
+    for task_id, (status, worker_id, tiles) in task_samples.items():
+        record_task_sample(task_id, status, worker_id, tiles, now)
+
+def vanished_active_tasks(seen_task_ids):
+    # Tasks of a job that just left the active/queued list are never listed
+    # again, so their final status has to be asked for explicitly.
+    return [tid for tid, tracked in _task_tracker.items() if tid not in seen_task_ids and tracked[0] == "active"]
+
+def finish_vanished_tasks(seen_task_ids, final_tasks, now):
+    for task_id in [tid for tid in _task_tracker if tid not in seen_task_ids]:
+        t = final_tasks.get(task_id)
+        if t:
+            record_task_sample(task_id, t.get("status"), (t.get("worker") or {}).get("id"), None, now)
+        del _task_tracker[task_id]
+
+def get_worker_perf_snapshots(now):
+    return {worker_id: perf.snapshot(now) for worker_id, perf in list(worker_perf.items())}
+
 def get_log_url(job_id, task_id):
     job_prefix = job_id[:4]
     return f"{FLAMENCO_JOBFILES_URL_ROOT}/job-{job_prefix}/{job_id}/task-{task_id}.txt"
 
-def parse_time_remaining(line):
-    m = re.search(r"Remaining:((?:\d{1,2}:)?\d{1,2}:\d{2}(?:\.\d{1,2})?)", line)
-    if m:
-        return m.group(1)
-    return None
+def get_proxy_log_url(job_id, task_id):
+    return f"/logs/{job_id}/{task_id}"
+
+LOG_CACHE_DIR = os.environ.get("LOG_CACHE_DIR", os.path.join(tempfile.gettempdir(), "flamenco-monitor", "logs"))
+LOG_CACHE_MAX_BYTES = int(os.environ.get("LOG_CACHE_MAX_BYTES", 2 * 1024 ** 3))
+# A mirrored log of an unfinished task younger than this is served as-is
+LOG_CACHE_FRESH_SECONDS = float(os.environ.get("LOG_CACHE_FRESH_SECONDS", 5))
+LOG_CHUNK_SIZE = 1024 * 1024
+ID_RE = re.compile(r"^[0-9A-Za-z-]{1,64}$")
+
+def content_range_total(value):
+    # "bytes 0-99/1234" or "bytes */1234"; the total may be "*" if unknown
+    _, _, total = (value or "").rpartition("/")
+    return int(total) if total.isdigit() else None
+
+class LogCacheEntry:
+    __slots__ = ("size", "fetched_at", "finished", "complete")
+
+    def __init__(self, size=0, fetched_at=0.0):
+        self.size = size
+        self.fetched_at = fetched_at
+        # finished: the task is done, so the log won't grow any more.
+        # complete: the mirror was refreshed after the task finished.
+        self.finished = False
+        self.complete = False
+
+class LogCache:
+    """Local disk mirror of task logs, evicted least-recently-used by size.
+
+    Logs normally only grow, so refreshing a mirrored log asks the Manager
+    for the bytes past what is already on disk and appends them. A log that
+    shrank (rotated or rewritten) is fetched again in full.
+    """
+
+    def __init__(self, root, max_bytes, on_evict=None):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        # _lock guards the bookkeeping; the per-log locks serialize
+        # refreshes of one log while its file is being written.
+        self._lock = threading.RLock()
+        self._locks = {}
+        os.makedirs(root, exist_ok=True)
+        self._load_existing()
 
-def extract_render_step_and_tile(lines):
-    tile_info = ""
-    step_label = ""
-    latest_tile = None
-    latest_total = None
-    # Patterns as before
-    step_patterns = [
-        (r"\|\s*Scene, View Layer \|\s*Synchronizing object \|\s*(.+)$", "Synchronizing object"),
-        (r"\|\s*Scene, View Layer \|\s*Synchronizing object$", "Synchronizing object"),
-        (r"\|\s*Scene, View Layer \|\s*Initializing$", "Initializing"),
-        (r"\|\s*Scene, View Layer \|\s*Waiting for render to start", "Waiting for render to start"),
-        (r"\|\s*Scene, View Layer \|\s*Loading render kernels", "Loading render kernels"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Scene$", "Updating Scene"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Shaders$", "Updating Shaders"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Procedurals$", "Updating Procedurals"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Background$", "Updating Background"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Camera$", "Updating Camera"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Meshes Flags$", "Updating Meshes Flags"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Objects Flags$", "Updating Objects Flags"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Meshes$", "Updating Meshes"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Particle Systems", "Updating Particle Systems"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Mesh \|\s*Computing normals", "Computing normals"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Mesh \|\s*Copying Mesh to device", "Copying Mesh to device"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Mesh \|\s*Copying Curves to device", "Copying Curves to device"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Mesh \|\s*Computing attributes", "Computing attributes"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Mesh \|\s*Copying Attributes to device", "Copying Attributes to device"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Mesh \|\s*Computing Displacement Mesh", "Computing Displacement Mesh"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Mesh \|\s*Updating Displacement Images", "Updating Displacement Images"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Geometry BVH.*?Building BVH", "Building BVH"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Scene BVH \|\s*Building", "Building Scene BVH"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Scene BVH \|\s*Building BVH", "Building Scene BVH"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Scene BVH \|\s*Copying BVH to device", "Copying BVH to device"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Objects \|\s*Copying Transformations to device", "Copying Transformations"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Objects \|\s*Applying Static Transformations", "Applying Static Transformations"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Particle Systems \|\s*Copying Particles to device", "Copying Particles to device"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Objects$", "Updating Objects"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Lights \|\s*Importance map", "Updating Lights Importance map"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Lights$", "Updating Lights"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Images$", "Updating Images"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Camera Volume$", "Updating Camera Volume"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Lookup Tables$", "Updating Lookup Tables"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Film$", "Updating Film"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Integrator$", "Updating Integrator"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Baking$", "Updating Baking"),
-        (r"\|\s*Scene, View Layer \|\s*Updating Device \|\s*Writing constant memory", "Writing constant memory"),
-        (r"\|\s*Scene, View Layer \|\s*Rendered \d+/\d+ Tiles, Sample \d+/\d+", "Rendering Tiles"),
-        (r"\|\s*Scene, View Layer \|\s*Finishing$", "Finishing"),
-        (r"\|\s*Scene, View Layer \|\s*Denoising$", "Denoising"),
-        (r"\|\s*Scene \|\s*Reading full buffer from disk", "Reading full buffer from disk"),
-        (r"\|\s*Scene, View Layer \|\s*Finished$", "Finished"),
-    ]
-    # Always grab latest values in a single pass
-    for line in reversed(lines):
-        # Look for most recent tile render progress
-        m = re.search(r"Rendered\s+(\d+)\s*/\s*(\d+)\s+Tiles", line)
-        if m and latest_tile is None:
-            latest_tile = int(m.group(1))
-            latest_total = int(m.group(2))
-        # Always update step_label to the most recent matched step
-        for pat, label in step_patterns:
-            if re.search(pat, line):
-                if not step_label:
-                    step_label = label
-    if latest_tile is not None and latest_total is not None:
-        tile_info = f"Rendering tile {latest_tile} of {latest_total}"
-    return step_label, tile_info
-
-def fetch_render_progress_and_step(log_url):
+    def _load_existing(self):
+        found = []
+        for job_id in os.listdir(self.root):
+            job_dir = os.path.join(self.root, job_id)
+            if not os.path.isdir(job_dir):
+                continue
+            for name in os.listdir(job_dir):
+                if name.startswith("task-") and name.endswith(".txt"):
+                    st = os.stat(os.path.join(job_dir, name))
+                    found.append((st.st_mtime, job_id, name[5:-4], st.st_size))
+        with self._lock:
+            for mtime, job_id, task_id, size in sorted(found):
+                self.entries[(job_id, task_id)] = LogCacheEntry(size)
+                self.total_bytes += size
+            self._evict()
+
+    def path(self, job_id, task_id):
+        return os.path.join(self.root, job_id, f"task-{task_id}.txt")
+
+    def get(self, job_id, task_id):
+        with self._lock:
+            entry = self.entries.get((job_id, task_id))
+            if entry is not None:
+                self.entries.move_to_end((job_id, task_id))
+            return entry
+
+    def mark_finished(self, job_id, task_id):
+        entry = self.entries.get((job_id, task_id))
+        if entry is not None:
+            entry.finished = True
+
+    def refresh(self, job_id, task_id, timeout=3, finished=False):
+        """Pull new log bytes from the Manager.
+
+        finished marks the task as done, making this the final refresh.
+        Returns (entry, old_size), or (None, 0) when the Manager has no log.
+        """
+        key = (job_id, task_id)
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        with key_lock:
+            try:
+                return self._fetch(key, timeout, finished)
+            finally:
+                with self._lock:
+                    if key not in self.entries and self._locks.get(key) is key_lock:
+                        # Nothing was mirrored, so keep no lock for the key
+                        del self._locks[key]
+
+    def _fetch(self, key, timeout, finished):
+        job_id, task_id = key
+        entry = self.entries.get(key)
+        old_size = entry.size if entry is not None else 0
+        headers = {"Range": f"bytes={old_size}-"} if old_size else {}
+        with requests.get(get_log_url(job_id, task_id), headers=headers, timeout=timeout, stream=True) as resp:
+            total = content_range_total(resp.headers.get("Content-Range"))
+            if resp.status_code in (206, 416) and entry is not None and total is not None and total < old_size:
+                size = None
+            elif resp.status_code == 416 and entry is not None:
+                size = old_size
+            elif resp.status_code == 206 and entry is not None:
+                size = self._append(key, resp)
+            elif resp.status_code == 200:
+                old_size = 0
+                size = self._replace(key, resp)
+            else:
+                return None, 0
+        if size is None:
+            # The log is shorter than the mirror, so it was rotated
+            with requests.get(get_log_url(job_id, task_id), timeout=timeout, stream=True) as resp:
+                if resp.status_code != 200:
+                    return None, 0
+                old_size = 0
+                size = self._replace(key, resp)
+        with self._lock:
+            entry = self.entries.setdefault(key, LogCacheEntry())
+            self.total_bytes += size - entry.size
+            entry.size = size
+            entry.fetched_at = time.monotonic()
+            entry.finished = entry.finished or finished
+            if entry.finished:
+                entry.complete = True
+            self.entries.move_to_end(key)
+            self._evict()
+        return entry, old_size
+
+    def _append(self, key, resp):
+        # Appending leaves the bytes that open memory maps cover untouched
+        with open(self.path(*key), "ab") as f:
+            for chunk in resp.iter_content(LOG_CHUNK_SIZE):
+                f.write(chunk)
+            return f.tell()
+
+    def _replace(self, key, resp):
+        # Truncating a file that a viewer or the search index has mapped
+        # would make their reads fault, so a new file is swapped in instead.
+        path = self.path(*key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "wb") as f:
+            for chunk in resp.iter_content(LOG_CHUNK_SIZE):
+                f.write(chunk)
+            size = f.tell()
+        os.replace(path + ".tmp", path)
+        return size
+
+    def _evict(self):
+        for key in list(self.entries):
+            if self.total_bytes <= self.max_bytes or len(self.entries) <= 1:
+                break
+            key_lock = self._locks.get(key)
+            if key_lock is not None and key_lock.locked():
+                # Being refreshed right now; its file is open for writing
+                continue
+            entry = self.entries.pop(key)
+            self.total_bytes -= entry.size
+            self._locks.pop(key, None)
+            if self.on_evict is not None:
+                self.on_evict(*key)
+            try:
+                os.remove(self.path(*key))
+            except OSError:
+                pass
+
+# Log parsing is CPU-bound regex work. Running it on the eventlet hub would
+# stall every websocket, so it is handed to a pool of worker processes.
+PARSE_WORKERS = int(os.environ.get("PARSE_WORKERS", os.cpu_count() or 1))
+LOG_FETCH_CONCURRENCY = int(os.environ.get("LOG_FETCH_CONCURRENCY", 8))
+_parse_executor = None
+_parse_executor_lock = threading.Lock()
+
+def get_parse_executor():
+    global _parse_executor
+    with _parse_executor_lock:
+        if _parse_executor is None and PARSE_WORKERS > 0:
+            # "spawn" keeps the workers clear of the monkey-patched hub state.
+            _parse_executor = ProcessPoolExecutor(
+                max_workers=PARSE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+    return _parse_executor
+
+def discard_parse_executor(executor):
+    # A worker that died (out of memory, a crash in Pillow) breaks the whole
+    # pool for good, so the next run_parse starts a fresh one.
+    global _parse_executor
+    with _parse_executor_lock:
+        if _parse_executor is executor:
+            _parse_executor = None
+    executor.shutdown(wait=False)
+
+def run_parse(fn, *args):
+    for attempt in range(2):
+        executor = get_parse_executor()
+        if executor is None:
+            return fn(*args)
+        try:
+            future = executor.submit(fn, *args)
+            if MONITOR_RUNTIME == "eventlet":
+                # Park only this green thread, not the whole hub
+                done = eventlet.event.Event()
+                future.add_done_callback(lambda f: done.send())
+                done.wait()
+            # Under asgi this runs on a worker thread, which may simply block
+            return future.result()
+        except BrokenProcessPool:
+            discard_parse_executor(executor)
+            if attempt:
+                raise
+
+LOG_INDEX_MAX_POSTINGS = int(os.environ.get("LOG_INDEX_MAX_POSTINGS", 5_000_000))
+class LogIndex:
+    """Inverted index over mirrored logs: token -> log -> line offsets.
+
+    Posting lists are packed into arrays; whole logs are dropped,
+    least recently indexed first, once the total exceeds max_postings.
+    """
+
+    def __init__(self, max_postings):
+        self.max_postings = max_postings
+        self.postings = {}
+        # (job_id, task_id) -> [indexed_to, tokens, busy]
+        self.docs = OrderedDict()
+        self.total_postings = 0
+        self._lock = threading.RLock()
+
+    def update(self, job_id, task_id, size, replaced=False):
+        key = (job_id, task_id)
+        with self._lock:
+            if replaced:
+                self.remove(job_id, task_id)
+            doc = self.docs.setdefault(key, [0, set(), False])
+            if doc[2] or doc[0] >= size:
+                return
+            doc[2] = True
+        try:
+            end, new_postings = run_parse(tokenize_log_file, log_cache.path(job_id, task_id), doc[0], size)
+        finally:
+            doc[2] = False
+        with self._lock:
+            if self.docs.get(key) is not doc:
+                return
+            doc[0] = end
+            for token, offsets in new_postings.items():
+                by_doc = self.postings.setdefault(token, {})
+                doc[1].add(token)
+                existing = by_doc.get(key, array("Q"))
+                if existing is None:
+                    continue
+                if len(existing) + len(offsets) > LOG_INDEX_MAX_LINES_PER_TOKEN:
+                    self.total_postings -= len(existing)
+                    by_doc[key] = None
+                    continue
+                existing.extend(offsets)
+                by_doc[key] = existing
+                self.total_postings += len(offsets)
+            self.docs.move_to_end(key)
+            while self.total_postings > self.max_postings and len(self.docs) > 1:
+                self.remove(*next(iter(self.docs)))
+
+    def remove(self, job_id, task_id):
+        with self._lock:
+            doc = self.docs.pop((job_id, task_id), None)
+            if doc is None:
+                return
+            for token in doc[1]:
+                by_doc = self.postings.get(token)
+                offsets = by_doc.pop((job_id, task_id), None)
+                if offsets is not None:
+                    self.total_postings -= len(offsets)
+                if not by_doc:
+                    del self.postings[token]
+
+    def search(self, query, limit=50):
+        needle = query.strip().lower()
+        tokens = {t.lower().decode("ascii") for t in TOKEN_RE.findall(needle.encode("utf-8", errors="ignore"))}
+        if not tokens or limit < 1:
+            return []
+        with self._lock:
+            by_token = [self.postings.get(t) for t in tokens]
+            if any(not by_doc for by_doc in by_token):
+                return []
+            by_token.sort(key=len)
+            matched = []
+            for key in by_token[0]:
+                if all(key in by_doc for by_doc in by_token[1:]):
+                    lists = [by_doc[key] for by_doc in by_token if by_doc[key] is not None]
+                    # Copied, so lines can be checked without holding the lock
+                    matched.append((key, array("Q", min(lists, key=len)) if lists else None))
+        results = []
+        for key, candidates in matched:
+            results.extend(self._match_lines(key, needle, candidates, limit - len(results)))
+            if len(results) >= limit:
+                break
+        return results
+
+    def _match_lines(self, key, needle, candidates, limit):
+        job_id, task_id = key
+        matches = []
+        try:
+            f = open(log_cache.path(job_id, task_id), "rb")
+        except FileNotFoundError:
+            return matches
+        with f:
+            if candidates is None:
+                # Every query token is too common in this log to index
+                candidates = self._scan(f, needle)
+            for offset in candidates:
+                if len(matches) >= limit:
+                    break
+                f.seek(offset)
+                line = f.readline().decode("utf-8", errors="replace").rstrip("\r\n")
+                if needle in line.lower():
+                    matches.append({
+                        "job_id": job_id,
+                        "task_id": task_id,
+                        "log_url": get_proxy_log_url(job_id, task_id),
+                        "offset": offset,
+                        "line": line[:300],
+                    })
+        return matches
+
+    def _scan(self, f, needle):
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        pattern = re.compile(re.escape(needle.encode("utf-8")), re.IGNORECASE)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return [mm.rfind(b"\n", 0, m.start()) + 1 for m in pattern.finditer(mm)]
+
+log_index = LogIndex(LOG_INDEX_MAX_POSTINGS)
+
+def refresh_log(job_id, task_id, timeout=3, finished=False):
+    """Mirror new log bytes and feed them to the search index."""
+    entry, old_size = log_cache.refresh(job_id, task_id, timeout=timeout, finished=finished)
+    if entry is not None:
+        log_index.update(job_id, task_id, entry.size, replaced=old_size == 0)
+    return entry
+
+log_cache = None if IN_PARSE_WORKER else LogCache(LOG_CACHE_DIR, LOG_CACHE_MAX_BYTES, on_evict=log_index.remove)
+
+def refresh_final_log(job_id, task_id):
+    # A task that just finished may have written its last lines (often the
+    # error that failed it) after the previous refresh.
     try:
-        resp = requests.get(log_url, timeout=3)
-        if resp.status_code != 200:
+        refresh_log(job_id, task_id, finished=True)
+    except Exception as e:
+        print(f"Error mirroring final log for task {task_id}:", e)
+
+def fetch_render_progress_and_step(job_id, task_id, parser, task_name):
+    try:
+        entry = refresh_log(job_id, task_id)
+        if entry is None:
             return 0, 0, 0, "No log", None, "", "", ""
-        lines = resp.text.splitlines()
-        pat = re.compile(r"Rendered\s+(\d+)\s*/\s*(\d+)", re.IGNORECASE)
         last_update = datetime.now(SERVER_TZ).strftime('%Y-%m-%d %H:%M:%S')
-        step_label, tile_info = extract_render_step_and_tile(lines)
-        time_remaining = ""
-        # Use the *latest* progress numbers from the log
-        latest_cur, latest_total = 0, 0
-        for line in reversed(lines):
-            m = pat.search(line)
-            if m:
-                latest_cur, latest_total = int(m.group(1)), int(m.group(2))
-                break
-        pct = int(latest_cur / latest_total * 100) if latest_total else 0
-        for lookback in range(0, 10):
-            idx = len(lines) - lookback - 1
-            if idx < 0:
-                break
-            tr = parse_time_remaining(lines[idx])
-            if tr:
-                time_remaining = tr
-                break
-        if latest_total:
-            return latest_cur, latest_total, pct, f"{latest_cur} / {latest_total}", last_update, step_label, tile_info, time_remaining
-        # If no progress, check for "Building BVH"
-        for line in reversed(lines):
-            m2 = re.search(r"Building BVH\s+(\d+)%", line)
-            if m2:
-                pct = int(m2.group(1))
-                return pct, 100, pct, f"{pct}%", last_update, "Building BVH", "", ""
-        for line in reversed(lines):
-            tr = parse_time_remaining(line)
-            if tr:
-                time_remaining = tr
-                break
-        return 0, 0, 0, "No progress", last_update, step_label, tile_info, time_remaining
+        # The parse worker reads the mirrored log itself, so the bytes
+        # never have to be pickled across the process boundary.
+        return run_parse(parse_log_file, parser, log_cache.path(job_id, task_id), task_name, last_update)
     except Exception as e:
-        print(f"Error fetching log {log_url}:", e)
+        print(f"Error fetching log for task {task_id}:", e)
         return 0, 0, 0, "Log error", None, "", "", ""
 
+PREVIEW_CACHE_DIR = os.environ.get("PREVIEW_CACHE_DIR", os.path.join(tempfile.gettempdir(), "flamenco-monitor", "previews"))
+PREVIEW_CACHE_SIZE = int(os.environ.get("PREVIEW_CACHE_SIZE", 50))
+PREVIEW_DISK_ENTRIES = int(os.environ.get("PREVIEW_DISK_ENTRIES", 1000))
+PREVIEW_MAX_SIZE = int(os.environ.get("PREVIEW_MAX_SIZE", 320))
+PREVIEW_REFRESH_INTERVAL = float(os.environ.get("PREVIEW_REFRESH_INTERVAL", 2))
+PREVIEW_RETRY_SECONDS = float(os.environ.get("PREVIEW_RETRY_SECONDS", 5))
+PREVIEW_RETRY_MAX_SECONDS = float(os.environ.get("PREVIEW_RETRY_MAX_SECONDS", 300))
+# The Manager keeps these renditions of a job's last rendered frame
+LAST_RENDERED_FULL = "last-rendered.jpg"
+LAST_RENDERED_SMALL = "last-rendered-small.jpg"
+
+def get_last_rendered(job_id, timeout=10):
+    """Fetch the image bytes of a job's last rendered frame, or None.
+
+    With Pillow the full-size rendition is fetched so the thumbnail is cut
+    from it; without, the Manager's small rendition is used as-is.
+    """
+    response = requests.get(f"{FLAMENCO_API_URL}/jobs/{job_id}/last-rendered", timeout=timeout)
+    if response.status_code == 204:
+        return None
+    response.raise_for_status()
+    info = response.json()
+    suffixes = info.get("suffixes") or []
+    preferred = LAST_RENDERED_FULL if Image is not None else LAST_RENDERED_SMALL
+    suffix = preferred if preferred in suffixes else (suffixes[0] if suffixes else None)
+    if suffix is None:
+        return None
+    base = info.get("base", "").strip("/")
+    response = requests.get(f"http://{FLAMENCO_SERVER}/{base}/{suffix}", timeout=timeout)
+    response.raise_for_status()
+    return response.content
+
+class PreviewCache:
+    """Thumbnails of each job's last rendered frame.
+
+    A job's frame is only fetched from the Manager when the job's `updated`
+    timestamp changes, so any number of viewers cost one fetch per new
+    frame. Thumbnails live on disk; the recently served ones also in memory.
+    Fetching runs on its own loop, apart from the progress broadcasts, and
+    a job whose fetch failed is retried with exponential backoff.
+    """
+
+    def __init__(self, root, max_entries, max_disk_entries):
+        self.root = root
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.updated = {}
+        self.wanted = {}  # job_id -> updated, for the jobs on display
+        self.failures = {}  # job_id -> (retry_at, delay)
+        self.thumbs = OrderedDict()  # job_id -> (etag, data)
+        self.on_disk = OrderedDict()
+        self._lock = threading.Lock()
+        self._locks = {}
+        os.makedirs(root, exist_ok=True)
+        found = []
+        for name in os.listdir(root):
+            if name.endswith(".jpg"):
+                found.append((os.stat(os.path.join(root, name)).st_mtime, name[:-4]))
+        for _, job_id in sorted(found):
+            self.on_disk[job_id] = True
+
+    def path(self, job_id):
+        return os.path.join(self.root, f"{job_id}.jpg")
+
+    def needs_refresh(self, job_id, updated):
+        return self.updated.get(job_id) != updated
+
+    def track(self, jobs):
+        """Set the jobs whose previews the refresh loop keeps current."""
+        wanted = {job.get("id"): job.get("updated") for job in jobs}
+        with self._lock:
+            self.wanted = wanted
+            # Jobs that left the list are forgotten, also the many that never
+            # had a frame and so never reach the disk eviction
+            for state in (self.failures, self.updated, self._locks):
+                for job_id in [k for k in state if k not in wanted]:
+                    del state[job_id]
+
+    def due(self, now):
+        """(job_id, updated) of the tracked jobs to fetch a frame for now."""
+        with self._lock:
+            return [(job_id, updated) for job_id, updated in self.wanted.items()
+                    if self.needs_refresh(job_id, updated)
+                    and self.failures.get(job_id, (0, 0))[0] <= now]
+
+    def get(self, job_id):
+        """Return (etag, data) of a job's thumbnail, or None."""
+        with self._lock:
+            thumb = self.thumbs.get(job_id)
+            if thumb is not None:
+                self.thumbs.move_to_end(job_id)
+                return thumb
+            if job_id not in self.on_disk:
+                return None
+        try:
+            with open(self.path(job_id), "rb") as f:
+                return self._remember(job_id, f.read())
+        except FileNotFoundError:
+            return None
+
+    def refresh(self, job_id, updated, timeout=10):
+        with self._lock:
+            key_lock = self._locks.setdefault(job_id, threading.Lock())
+        with key_lock:
+            if not self.needs_refresh(job_id, updated):
+                return
+            try:
+                data = get_last_rendered(job_id, timeout)
+                if data is not None:
+                    # Decoding and resizing is CPU work, so it goes to the parse pool
+                    self._store(job_id, run_parse(make_thumbnail, data, PREVIEW_MAX_SIZE))
+            except Exception:
+                with self._lock:
+                    _, delay = self.failures.get(job_id, (0, 0))
+                    delay = min(max(delay * 2, PREVIEW_RETRY_SECONDS), PREVIEW_RETRY_MAX_SECONDS)
+                    self.failures[job_id] = (time.monotonic() + delay, delay)
+                raise
+            with self._lock:
+                self.failures.pop(job_id, None)
+            self.updated[job_id] = updated
+
+    def _store(self, job_id, data):
+        path = self.path(job_id)
+        with open(path + ".tmp", "wb") as f:
+            f.write(data)
+        os.replace(path + ".tmp", path)
+        self._remember(job_id, data)
+        with self._lock:
+            self.on_disk[job_id] = True
+            self.on_disk.move_to_end(job_id)
+            while len(self.on_disk) > self.max_disk_entries:
+                old_id, _ = self.on_disk.popitem(last=False)
+                self.thumbs.pop(old_id, None)
+                self.updated.pop(old_id, None)
+                self._locks.pop(old_id, None)
+                try:
+                    os.remove(self.path(old_id))
+                except OSError:
+                    pass
+
+    def _remember(self, job_id, data):
+        thumb = (hashlib.sha1(data).hexdigest()[:20], data)
+        with self._lock:
+            self.thumbs[job_id] = thumb
+            self.thumbs.move_to_end(job_id)
+            while len(self.thumbs) > self.max_entries:
+                self.thumbs.popitem(last=False)
+        return thumb
+
+preview_cache = None if IN_PARSE_WORKER else PreviewCache(PREVIEW_CACHE_DIR, PREVIEW_CACHE_SIZE, PREVIEW_DISK_ENTRIES)
+
+def refresh_preview(job_id, updated):
+    try:
+        preview_cache.refresh(job_id, updated)
+    except Exception as e:
+        print(f"Error fetching preview for job {job_id}:", e)
+
+def attach_previews(farm):
+    for row in farm.jobs.values():
+        thumb = preview_cache.get(row.job_id)
+        # The ETag in the URL makes a new frame a new image for the browser
+        row.assign("preview_url", f"/preview/{row.job_id}?v={thumb[0]}" if thumb is not None else None)
+
 
 def parse_iso8601(dtstr):
     if dtstr:
@@ -206,476 +873,856 @@ def parse_iso8601(dtstr):
             return None
     return None
 
-def collect_job_data():
-    jobs = get_jobs(["active", "queued"])
-    jobs_display = []
-    for job in jobs:
-        job_id = job.get("id")
-        job_name = job.get("name", "-")
-        tasks = get_tasks(job_id)
-        n_tasks = len(tasks)
-        n_tasks_completed = 0
-        tasks_display = []
-        for t in tasks:
-            task_id = t.get("id")
-            task_name = t.get("name") or t.get("type") or task_id
-            task_status = t.get("status", "-").capitalize()
-            log_url = get_log_url(job_id, task_id)
-            if t.get("status") == "completed":
-                progress_pct = 100
-                progress_text = "Completed"
-                n_tasks_completed += 1
-                last_log_time = ""
-                step_label = "Finished"
-                tile_info = ""
-                time_remaining = ""
-            elif t.get("status") == "failed":
-                progress_pct = 100
-                progress_text = "Failed"
-                n_tasks_completed += 1
-                last_log_time = ""
-                step_label = "Failed"
-                tile_info = ""
-                time_remaining = ""
-            else:
-                cur, total, pct, progress, last_log_time, step_label, tile_info, time_remaining = fetch_render_progress_and_step(log_url)
-                progress_pct = pct
-                progress_text = progress
-            tasks_display.append({
-                "task_id": task_id,
-                "task_name": task_name,
-                "status": task_status,
-                "progress_pct": progress_pct,
-                "progress_text": progress_text,
-                "log_url": log_url,
-                "last_log_time": last_log_time or "",
-                "step_label": step_label,
-                "tile_info": tile_info,
-                "time_remaining": time_remaining,
+# Display labels repeat across thousands of tasks, so each distinct one is
+# stored once.
+_labels = {}
+
+def label(text):
+    interned = _labels.get(text)
+    if interned is None:
+        if len(_labels) >= 4096:
+            _labels.clear()
+        interned = _labels[text] = sys.intern(text)
+    return interned
+
+def status_label(status):
+    return label(status.capitalize())
+
+def _assign(row, name, value):
+    # Changing a field drops the row's cached JSON
+    if getattr(row, name) != value:
+        setattr(row, name, value)
+        row.fragment = None
+
+def _dumps(obj):
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+class TaskRow:
+    __slots__ = ("job_id", "task_id", "task_name", "status", "progress_pct", "progress_text",
+                 "last_log_time", "step_label", "tile_info", "time_remaining", "cycle",
+                 "manager_status", "fragment")
+
+    assign = _assign
+
+    def __init__(self, job_id, task_id):
+        self.job_id = job_id
+        self.task_id = task_id
+        self.task_name = None
+        self.status = None
+        self.progress_pct = 0
+        self.progress_text = ""
+        self.last_log_time = ""
+        self.step_label = ""
+        self.tile_info = ""
+        self.time_remaining = ""
+        self.cycle = 0
+        # The Manager's status as of the last cycle; not part of the JSON
+        self.manager_status = None
+        self.fragment = None
+
+    def to_json(self):
+        if self.fragment is None:
+            self.fragment = _dumps({
+                "task_id": self.task_id,
+                "task_name": self.task_name,
+                "status": self.status,
+                "progress_pct": self.progress_pct,
+                "progress_text": self.progress_text,
+                "log_url": get_proxy_log_url(self.job_id, self.task_id),
+                "last_log_time": self.last_log_time,
+                "step_label": self.step_label,
+                "tile_info": self.tile_info,
+                "time_remaining": self.time_remaining,
             })
-        job_progress_pct = int((n_tasks_completed / n_tasks) * 100) if n_tasks > 0 else 0
-        jobs_display.append({
-            "job_id": job_id,
-            "job_name": job_name,
-            "job_progress_pct": job_progress_pct,
-            "job_status": job.get("status", "-").capitalize(),
-            "tasks": tasks_display,
-            "n_tasks": n_tasks,
-            "n_tasks_completed": n_tasks_completed
-        })
+        return self.fragment
+
+class JobRow:
+    __slots__ = ("job_id", "job_name", "job_status", "job_progress_pct", "n_tasks",
+                 "n_tasks_completed", "preview_url", "tasks", "fragment")
+
+    assign = _assign
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self.job_name = None
+        self.job_status = None
+        self.job_progress_pct = 0
+        self.n_tasks = 0
+        self.n_tasks_completed = 0
+        self.preview_url = None
+        self.tasks = {}
+        self.fragment = None
+
+    def json_parts(self, parts):
+        # The task rows' JSON goes into the payload as-is, not via a
+        # per-job copy
+        if self.fragment is None:
+            self.fragment = _dumps({
+                "job_id": self.job_id,
+                "job_name": self.job_name,
+                "job_progress_pct": self.job_progress_pct,
+                "job_status": self.job_status,
+                "n_tasks": self.n_tasks,
+                "n_tasks_completed": self.n_tasks_completed,
+                "preview_url": self.preview_url,
+            })[:-1] + b',"tasks":['
+        parts.append(self.fragment)
+        for i, t in enumerate(self.tasks.values()):
+            if i:
+                parts.append(b",")
+            parts.append(t.to_json())
+        parts.append(b"]}")
+
+class FarmModel:
+    """The active/queued jobs table, updated in place every cycle.
+
+    Rows persist between cycles and only the fields that changed are
+    written. Each row caches its own JSON, so an update re-serializes the
+    tasks that changed instead of the whole farm.
+    """
+
+    def __init__(self):
+        self.jobs = {}
+        self.cycle = 0
 
-    completed_jobs = get_jobs(["completed"])
-    for job in completed_jobs:
+    def update(self, jobs, task_lists, looked_up_workers):
+        """Fold a cycle's Manager data into the rows.
+
+        Returns (pending_logs, final_logs, task_samples). pending_logs pairs
+        each row that needs its log parsed with the fetch arguments,
+        final_logs lists the (job_id, task_id) of tasks that finished since
+        the last cycle, whose logs need one last refresh, and task_samples
+        feeds the per-worker performance tracker.
+        """
+        self.cycle += 1
+        pending_logs = []
+        final_logs = []
+        task_samples = {}
+        rows = {}
+        for job, tasks in zip(jobs, task_lists):
+            job_id = job.get("id")
+            row = self.jobs.get(job_id) or JobRow(job_id)
+            rows[job_id] = row
+            n_tasks_completed = 0
+            for t in tasks:
+                task_id = t.get("id")
+                status = t.get("status")
+                task_type = t.get("task_type") or t.get("type")
+                task_row = row.tasks.get(task_id)
+                if task_row is None:
+                    task_row = row.tasks[task_id] = TaskRow(job_id, task_id)
+                task_row.cycle = self.cycle
+                if task_row.manager_status not in (None, "completed", "failed") and status in ("completed", "failed"):
+                    final_logs.append((job_id, task_id))
+                task_row.manager_status = status
+                task_row.assign("task_name", t.get("name") or task_type or task_id)
+                task_row.assign("status", status_label(t.get("status", "-")))
+                parser = get_progress_parser(task_type, status)
+                if status in ("completed", "failed"):
+                    n_tasks_completed += 1
+                if parser is not None:
+                    # Filled in from the log later
+                    pending_logs.append((task_row, (job_id, task_id, parser, task_row.task_name)))
+                elif status in ("completed", "failed"):
+                    if status == "completed":
+                        self._assign_progress(task_row, 100, "Completed", "", "Finished", "", "")
+                    else:
+                        self._assign_progress(task_row, 100, "Failed", "", "Failed", "", "")
+                    log_cache.mark_finished(job_id, task_id)
+                else:
+                    self._assign_progress(task_row, 0, task_row.status, "", "", "", "")
+                worker_id = task_worker_id(t) or looked_up_workers.get(task_id)
+                task_samples[task_id] = [status, worker_id, None]
+            if len(row.tasks) != len(tasks):
+                for task_id in [k for k, v in row.tasks.items() if v.cycle != self.cycle]:
+                    del row.tasks[task_id]
+            n_tasks = len(tasks)
+            row.assign("job_name", job.get("name", "-"))
+            row.assign("job_status", status_label(job.get("status", "-")))
+            row.assign("n_tasks", n_tasks)
+            row.assign("n_tasks_completed", n_tasks_completed)
+            row.assign("job_progress_pct", int((n_tasks_completed / n_tasks) * 100) if n_tasks > 0 else 0)
+        # Tasks still running when their job left the list finished unseen
+        for job_id, row in self.jobs.items():
+            if job_id not in rows:
+                final_logs.extend((job_id, task_id) for task_id, t in row.tasks.items() if t.manager_status == "active")
+        self.jobs = rows
+        return pending_logs, final_logs, task_samples
+
+    @staticmethod
+    def _assign_progress(task_row, pct, progress_text, last_log_time, step_label, tile_info, time_remaining):
+        task_row.assign("progress_pct", pct)
+        task_row.assign("progress_text", progress_text)
+        task_row.assign("last_log_time", last_log_time or "")
+        task_row.assign("step_label", label(step_label) if step_label else "")
+        task_row.assign("tile_info", tile_info)
+        task_row.assign("time_remaining", time_remaining)
+
+    def json_parts(self, parts):
+        parts.append(b"[")
+        for i, row in enumerate(self.jobs.values()):
+            if i:
+                parts.append(b",")
+            row.json_parts(parts)
+        parts.append(b"]")
+
+def apply_log_results(pending_logs, log_results, task_samples):
+    for (task_row, _), result in zip(pending_logs, log_results):
+        cur, total, pct, progress, last_log_time, step_label, tile_info, time_remaining = result
+        FarmModel._assign_progress(task_row, pct, progress, last_log_time, step_label, tile_info, time_remaining)
+        if tile_info:
+            task_samples[task_row.task_id][2] = cur
+
+farm = FarmModel()
+
+def encode_update(data):
+    """JSON-encode an update; a FarmModel in it contributes its cached rows."""
+    parts = [b"{"]
+    for i, (key, value) in enumerate(data.items()):
+        parts.append(b"%s%s:" % (b"," if i else b"", _dumps(key)))
+        if isinstance(value, FarmModel):
+            value.json_parts(parts)
+        else:
+            parts.append(_dumps(value))
+    parts.append(b"}")
+    return b"".join(parts)
+
+COMPLETED_JOBS_LIMIT = int(os.environ.get("COMPLETED_JOBS_LIMIT", 10))
+COMPLETED_JOBS_MAX_LIMIT = 200
+COMPLETED_RECONCILE_SECONDS = float(os.environ.get("COMPLETED_RECONCILE_SECONDS", 600))
+
+class CompletedJobsTracker:
+    """The newest N completed jobs, kept current from observed transitions.
+
+    Only startup, the periodic reconcile and raising N query every completed
+    job. In between, jobs that drop out of the active/queued list are looked
+    up one by one, and the completed ones go into a min-heap of size N.
+    """
+
+    def __init__(self, limit, reconcile_seconds):
+        self.limit = limit
+        self.reconcile_seconds = reconcile_seconds
+        self.heap = []  # (updated_dt, job_id, job)
+        self.active_ids = set()
+        self.last_reconcile = None
+        self.needs_reconcile = True
+        self._lock = threading.Lock()
+
+    def reconcile_due(self, now):
+        return self.needs_reconcile or now - self.last_reconcile > self.reconcile_seconds
+
+    def reconcile(self, completed_jobs, now):
+        entries = []
+        for job in completed_jobs:
+            job['updated_dt'] = parse_iso8601(job.get("updated") or job.get("completed"))
+            if job['updated_dt']:
+                entries.append((job['updated_dt'], job.get("id"), job))
+        with self._lock:
+            self.heap = heapq.nlargest(self.limit, entries, key=lambda e: e[:2])
+            heapq.heapify(self.heap)
+            self.last_reconcile = now
+            self.needs_reconcile = False
+
+    def left_active(self, active_jobs):
+        """Record this cycle's active/queued jobs; return the ids that left."""
+        current = {job.get("id") for job in active_jobs}
+        gone = self.active_ids - current
+        self.active_ids = current
+        with self._lock:
+            requeued = [e for e in self.heap if e[1] in current]
+            if requeued:
+                # A finished job was requeued; refill its slot at the next reconcile
+                self.heap = [e for e in self.heap if e[1] not in current]
+                heapq.heapify(self.heap)
+                self.needs_reconcile = True
+        return gone
+
+    def add(self, job):
+        if job.get("status") != "completed":
+            return
         job['updated_dt'] = parse_iso8601(job.get("updated") or job.get("completed"))
-    completed_jobs = sorted(
-        [j for j in completed_jobs if j.get('updated_dt')],
-        key=lambda x: x['updated_dt'], reverse=True
+        if not job['updated_dt']:
+            return
+        with self._lock:
+            self.heap = [e for e in self.heap if e[1] != job.get("id")]
+            heapq.heapify(self.heap)
+            heapq.heappush(self.heap, (job['updated_dt'], job.get("id"), job))
+            while len(self.heap) > self.limit:
+                heapq.heappop(self.heap)
+
+    def set_limit(self, limit):
+        with self._lock:
+            if limit > self.limit:
+                # Jobs beyond the old N were never kept
+                self.needs_reconcile = True
+            self.limit = limit
+            while len(self.heap) > limit:
+                heapq.heappop(self.heap)
+
+    def jobs(self):
+        with self._lock:
+            return [job for _, _, job in sorted(self.heap, key=lambda e: e[:2], reverse=True)]
+
+    def get(self, job_id):
+        with self._lock:
+            return next((job for _, entry_id, job in self.heap if entry_id == job_id), None)
+
+completed_tracker = CompletedJobsTracker(COMPLETED_JOBS_LIMIT, COMPLETED_RECONCILE_SECONDS)
+
+COMPLETED_DETAILS_CACHE_SIZE = int(os.environ.get("COMPLETED_DETAILS_CACHE_SIZE", 50))
+# (job_id, updated) -> task rows. A finished job's tasks don't change unless
+# the job is touched again, which also bumps "updated".
+_completed_details_cache = OrderedDict()
+
+def build_completed_job(job):
+    job_id = job.get("id")
+    dt_utc = job['updated_dt']
+    dt_local = utc_to_local(dt_utc)
+    return {
+        "job_id": job_id,
+        "job_name": job.get("name", "-"),
+        "completed_time": dt_local.strftime("%Y-%m-%d %H:%M:%S") if dt_local else "N/A",
+        "job_status": job.get("status", "-").capitalize(),
+    }
+
+def build_completed_job_tasks(job_id, task_objs):
+    task_display = []
+    for t in task_objs:
+        task_id = t.get("id")
+        task_type = t.get("task_type") or t.get("type")
+        task_name = t.get("name") or task_type or task_id
+        task_status = t.get("status", "-").capitalize()
+        log_url = get_proxy_log_url(job_id, task_id)
+        if t.get("status") == "completed":
+            progress_pct = 100
+            progress_text = "Completed"
+            step_label = "Finished"
+            log_cache.mark_finished(job_id, task_id)
+        elif t.get("status") == "failed":
+            progress_pct = 100
+            progress_text = "Failed"
+            step_label = "Failed"
+            log_cache.mark_finished(job_id, task_id)
+        else:
+            # Nothing in a finished job is still rendering, so there is no
+            # progress to parse out of the log.
+            progress_pct = 0
+            progress_text = task_status
+            step_label = ""
+        task_display.append({
+            "task_id": task_id,
+            "task_name": task_name,
+            "status": task_status,
+            "progress_pct": progress_pct,
+            "progress_text": progress_text,
+            "log_url": log_url,
+            "step_label": step_label,
+            "tile_info": "",
+            "time_remaining": "",
+        })
+    return task_display
+
+def get_completed_job_tasks(job_id):
+    """Task rows of a job in the completed list, or None for other jobs.
+
+    Only those jobs are known to be finished, so only their tasks can be
+    cached as final. Manager errors propagate, so they aren't mistaken for
+    a job without tasks.
+    """
+    job = completed_tracker.get(job_id)
+    if job is None:
+        return None
+    key = (job_id, job.get("updated"))
+    tasks = _completed_details_cache.get(key)
+    if tasks is not None:
+        _completed_details_cache.move_to_end(key)
+        return tasks
+    tasks = build_completed_job_tasks(job_id, fetch_tasks(job_id))
+    _completed_details_cache[key] = tasks
+    while len(_completed_details_cache) > COMPLETED_DETAILS_CACHE_SIZE:
+        _completed_details_cache.popitem(last=False)
+    return tasks
+
+def attach_worker_perf(workers, now):
+    perf_snapshots = get_worker_perf_snapshots(now)
+    for worker in workers:
+        worker["perf"] = perf_snapshots.get(worker.get("id"))
+    return workers
+
+def collect_job_data():
+    jobs = get_jobs(["active", "queued"])
+    task_lists = [get_tasks(job.get("id")) for job in jobs]
+    looked_up_workers = {
+        t.get("id"): task_worker_id(get_task(t.get("id")) or {})
+        for tasks in task_lists for t in tasks if needs_worker_lookup(t)
+    }
+    pending_logs, final_logs, task_samples = farm.update(jobs, task_lists, looked_up_workers)
+
+    # Logs are fetched concurrently, so the parse workers can chew on
+    # several of them at once.
+    log_pool = eventlet.GreenPool(LOG_FETCH_CONCURRENCY)
+    for job_id, task_id in final_logs:
+        log_pool.spawn_n(refresh_final_log, job_id, task_id)
+    log_results = log_pool.starmap(fetch_render_progress_and_step, [args for _, args in pending_logs])
+    apply_log_results(pending_logs, log_results, task_samples)
+    log_pool.waitall()
+
+    preview_cache.track(jobs)
+    attach_previews(farm)
+
+    now = time.monotonic()
+    record_task_samples(task_samples, now)
+    final_tasks = {task_id: get_task(task_id) for task_id in vanished_active_tasks(task_samples)}
+    finish_vanished_tasks(task_samples, final_tasks, now)
+
+    # Completed jobs are refreshed from jobs that left the active list; the
+    # full completed query only runs on reconcile.
+    if completed_tracker.reconcile_due(now):
+        completed_tracker.reconcile(get_jobs(["completed"]), now)
+    for job_id in completed_tracker.left_active(jobs):
+        completed_tracker.add(get_job(job_id) or {})
+    completed_jobs_display = [build_completed_job(job) for job in completed_tracker.jobs()]
+
+    workers = attach_worker_perf(get_workers(), now)
+    return {"jobs": farm, "completed_jobs": completed_jobs_display,
+            "completed_jobs_limit": completed_tracker.limit, "workers": workers}
+
+async def collect_job_data_async(client):
+    jobs = await aget_jobs(client, ["active", "queued"])
+    task_lists = await asyncio.gather(*(aget_tasks(client, job.get("id")) for job in jobs))
+    lookups = [t.get("id") for tasks in task_lists for t in tasks if needs_worker_lookup(t)]
+    looked_up = await asyncio.gather(*(aget_task(client, task_id) for task_id in lookups))
+    looked_up_workers = {task_id: task_worker_id(t or {}) for task_id, t in zip(lookups, looked_up)}
+    pending_logs, final_logs, task_samples = farm.update(jobs, task_lists, looked_up_workers)
+
+    # Mirroring a log streams it to disk, so that part runs on worker threads
+    log_slots = asyncio.Semaphore(LOG_FETCH_CONCURRENCY)
+    async def fetch_log(func, args):
+        async with log_slots:
+            return await asyncio.to_thread(func, *args)
+    log_results, _ = await asyncio.gather(
+        asyncio.gather(*(fetch_log(fetch_render_progress_and_step, args) for _, args in pending_logs)),
+        asyncio.gather(*(fetch_log(refresh_final_log, args) for args in final_logs)),
     )
-    completed_jobs_limit = 10
-    completed_jobs_display = []
-    for job in completed_jobs[:completed_jobs_limit]:
-        job_id = job.get("id")
-        dt_utc = job['updated_dt']
-        dt_local = utc_to_local(dt_utc)
-        completed_job = {
-            "job_id": job_id,
-            "job_name": job.get("name", "-"),
-            "completed_time": dt_local.strftime("%Y-%m-%d %H:%M:%S") if dt_local else "N/A",
-            "job_status": job.get("status", "-").capitalize(),
-        }
-        task_objs = get_tasks(job_id)
-        task_display = []
-        for t in task_objs:
-            task_id = t.get("id")
-            task_name = t.get("name") or t.get("type") or task_id
-            task_status = t.get("status", "-").capitalize()
-            log_url = get_log_url(job_id, task_id)
-            if t.get("status") == "completed":
-                progress_pct = 100
-                progress_text = "Completed"
-                step_label = "Finished"
-                tile_info = ""
-                time_remaining = ""
-            elif t.get("status") == "failed":
-                progress_pct = 100
-                progress_text = "Failed"
-                step_label = "Failed"
-                tile_info = ""
-                time_remaining = ""
-            else:
-                cur, total, pct, progress, last_log_time, step_label, tile_info, time_remaining = fetch_render_progress_and_step(log_url)
-                progress_pct = pct
-                progress_text = progress
-            task_display.append({
-                "task_id": task_id,
-                "task_name": task_name,
-                "status": task_status,
-                "progress_pct": progress_pct,
-                "progress_text": progress_text,
-                "log_url": log_url,
-                "step_label": step_label,
-                "tile_info": tile_info,
-                "time_remaining": time_remaining,
-            })
-        completed_job['tasks'] = task_display
-        completed_jobs_display.append(completed_job)
+    apply_log_results(pending_logs, log_results, task_samples)
+
+    preview_cache.track(jobs)
+    attach_previews(farm)
 
-    return {"jobs": jobs_display, "completed_jobs": completed_jobs_display, "workers": get_workers()}
+    now = time.monotonic()
+    record_task_samples(task_samples, now)
+    vanished = vanished_active_tasks(task_samples)
+    final_tasks = await asyncio.gather(*(aget_task(client, task_id) for task_id in vanished))
+    finish_vanished_tasks(task_samples, dict(zip(vanished, final_tasks)), now)
+
+    if completed_tracker.reconcile_due(now):
+        completed_tracker.reconcile(await aget_jobs(client, ["completed"]), now)
+    left = list(completed_tracker.left_active(jobs))
+    for job in await asyncio.gather(*(aget_job(client, job_id) for job_id in left)):
+        completed_tracker.add(job or {})
+    completed_jobs_display = [build_completed_job(job) for job in completed_tracker.jobs()]
+
+    workers = attach_worker_perf(await aget_workers(client), now)
+    return {"jobs": farm, "completed_jobs": completed_jobs_display,
+            "completed_jobs_limit": completed_tracker.limit, "workers": workers}
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+# The socket.io client is vendored so dashboards work without internet access
+STATIC_ASSETS = ("favicon.svg", "monitor.css", "monitor.js", "vendor/socket.io.min.js")
+ASSET_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+class Asset:
+    """A response body precompressed for each encoding that makes it smaller."""
+    __slots__ = ("mimetype", "etag", "bodies")
+
+    def __init__(self, data, mimetype):
+        self.mimetype = mimetype
+        self.etag = hashlib.sha256(data).hexdigest()[:16]
+        self.bodies = {"identity": data}
+        compressed = [("gzip", gzip.compress(data, 9, mtime=0))]
+        if brotli is not None:
+            compressed.append(("br", brotli.compress(data, quality=11)))
+        for encoding, body in compressed:
+            if len(body) < len(data):
+                self.bodies[encoding] = body
+
+def load_static_assets(names):
+    """Read the static assets once, keyed by content-hashed name.
+
+    Returns (assets, urls). A hashed name changes whenever the content
+    does, so browsers may cache it for good. A missing asset is an
+    incomplete install, so it fails startup rather than a page load.
+    """
+    assets, urls = {}, {}
+    for name in names:
+        with open(os.path.join(STATIC_DIR, name), "rb") as f:
+            data = f.read()
+        asset = Asset(data, mimetypes.guess_type(name)[0] or "application/octet-stream")
+        stem, ext = os.path.splitext(name)
+        hashed = f"{stem}.{asset.etag[:12]}{ext}"
+        assets[hashed] = asset
+        urls[name] = f"/assets/{hashed}"
+    return assets, urls
+
+static_assets, static_asset_urls = ({}, {}) if IN_PARSE_WORKER else load_static_assets(STATIC_ASSETS)
+
+def asset_url(name):
+    return static_asset_urls[name]
+
+def send_asset(asset, cache_control):
+    encoding = next((e for e in ("br", "gzip") if e in asset.bodies and request.accept_encodings[e]), "identity")
+    resp = Response(asset.bodies[encoding], mimetype=asset.mimetype)
+    if encoding != "identity":
+        resp.headers["Content-Encoding"] = encoding
+    resp.headers["Vary"] = "Accept-Encoding"
+    resp.headers["Cache-Control"] = cache_control
+    resp.set_etag(f"{asset.etag}-{encoding}")
+    return resp.make_conditional(request)
+
+# Rendered index pages by farm status; there are only a handful of those
+index_pages = {}
 
 @app.route("/")
 def index():
-    farm_status = get_farm_status()
-    return render_template_string(TEMPLATE, flamenco_server=FLAMENCO_SERVER, farm_status=farm_status)
-
-def background_thread():
-    while True:
-        data = collect_job_data()
-        data['farm_status'] = get_farm_status()
-        socketio.emit("progress_update", data)
-        socketio.sleep(1)
-
-@socketio.on('connect')
-def on_connect():
-    data = collect_job_data()
-    data['farm_status'] = get_farm_status()
-    emit("progress_update", data)
+    # The farm status comes from the last broadcast, not from the Manager
+    farm_status = (latest_data or {}).get("farm_status", "unknown")
+    page = index_pages.get(farm_status)
+    if page is None:
+        html = index_template.render(farm_status=farm_status, asset_url=asset_url)
+        page = Asset(html.encode(), "text/html")
+        if len(index_pages) >= 32:
+            index_pages.clear()
+        index_pages[farm_status] = page
+    return send_asset(page, "no-cache")
+
+@app.route("/assets/<path:name>")
+def static_asset(name):
+    asset = static_assets.get(name)
+    if asset is None:
+        abort(404)
+    return send_asset(asset, ASSET_CACHE_CONTROL)
+
+@app.route("/logs/<job_id>/<task_id>")
+def proxy_log(job_id, task_id):
+    if not ID_RE.match(job_id) or not ID_RE.match(task_id):
+        abort(404)
+    entry = log_cache.get(job_id, task_id)
+    needs_refresh = entry is None or (
+        not entry.complete
+        and (entry.finished or time.monotonic() - entry.fetched_at > LOG_CACHE_FRESH_SECONDS)
+    )
+    if needs_refresh:
+        try:
+            entry = refresh_log(job_id, task_id, timeout=30)
+        except Exception as e:
+            print(f"Error mirroring log for task {task_id}:", e)
+            if entry is None:
+                abort(502)
+        if entry is None:
+            abort(404)
+    try:
+        f = open(log_cache.path(job_id, task_id), "rb")
+    except FileNotFoundError:
+        abort(404)
+    return send_mmapped(f, entry.size)
+
+def send_mmapped(f, size):
+    # Serve a whole file or a single byte range straight from a read-only
+    # memory map, so concurrent viewers share the page cache.
+    start, stop, status = 0, size, 200
+    if request.range is not None:
+        byte_range = request.range.range_for_length(size)
+        if byte_range is None:
+            f.close()
+            return Response(status=416, headers={"Content-Range": f"bytes */{size}"})
+        start, stop = byte_range
+        status = 206
+
+    def generate():
+        with f:
+            if stop <= start:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for offset in range(start, stop, LOG_CHUNK_SIZE):
+                    yield mm[offset:min(offset + LOG_CHUNK_SIZE, stop)]
+
+    resp = Response(generate(), status=status, mimetype="text/plain")
+    resp.headers["Accept-Ranges"] = "bytes"
+    resp.headers["Content-Length"] = str(stop - start)
+    resp.headers["Cache-Control"] = "no-cache"
+    if status == 206:
+        resp.headers["Content-Range"] = f"bytes {start}-{stop - 1}/{size}"
+    return resp
+
+@app.route("/preview/<job_id>")
+def preview(job_id):
+    if not ID_RE.match(job_id):
+        abort(404)
+    thumb = preview_cache.get(job_id)
+    if thumb is None:
+        abort(404)
+    etag, data = thumb
+    resp = Response(data, mimetype="image/jpeg")
+    resp.set_etag(etag)
+    # Always revalidate; an unchanged frame costs a 304 and no body
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp.make_conditional(request)
+
+@app.route("/api/jobs/<job_id>/tasks")
+def api_job_tasks(job_id):
+    if not ID_RE.match(job_id):
+        abort(404)
+    try:
+        tasks = get_completed_job_tasks(job_id)
+    except Exception as e:
+        print(f"Error querying tasks for job {job_id}:", e)
+        return jsonify({"error": "could not load tasks from the Manager"}), 502
+    if tasks is None:
+        return jsonify({"error": "not a recently completed job"}), 404
+    return jsonify({"job_id": job_id, "tasks": tasks})
+
+@app.route("/api/completed-jobs/limit", methods=["GET", "POST"])
+def api_completed_jobs_limit():
+    if request.method == "POST":
+        limit = (request.get_json(silent=True) or {}).get("limit")
+        if not isinstance(limit, int) or not 1 <= limit <= COMPLETED_JOBS_MAX_LIMIT:
+            return jsonify({"error": f"limit must be an integer from 1 to {COMPLETED_JOBS_MAX_LIMIT}"}), 400
+        completed_tracker.set_limit(limit)
+    return jsonify({"limit": completed_tracker.limit})
+
+@app.route("/api/search")
+def api_search():
+    query = request.args.get("q", "")
+    limit = max(1, min(request.args.get("limit", 50, type=int), 500))
+    started = time.perf_counter()
+    results = log_index.search(query, limit=limit)
+    return jsonify({
+        "query": query,
+        "results": results,
+        "indexed_logs": len(log_index.docs),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    })
+
+@app.route("/api/workers/perf")
+def api_worker_perf():
+    perf_snapshots = get_worker_perf_snapshots(time.monotonic())
+    # Names come from the poller's last round, not another Manager query
+    names = {w.get("id"): w.get("name") for w in (latest_data or {}).get("workers", [])}
+    return jsonify({
+        "window_seconds": WORKER_PERF_WINDOW,
+        "window_tasks": WORKER_PERF_TASKS,
+        "workers": [
+            {"worker_id": worker_id, "name": names.get(worker_id), **snapshot}
+            for worker_id, snapshot in perf_snapshots.items()
+        ],
+    })
+
+# Last snapshot sent to clients; new clients get it straight away instead
+# of triggering a full round of Manager queries.
+latest_data = None
+_update_seq = 0
+
+def stamp_update(data):
+    # seq and sent_at let clients (and loadtest.py) spot missed updates
+    # and measure emit-to-receive latency.
+    global _update_seq
+    _update_seq += 1
+    data["seq"] = _update_seq
+    data["sent_at"] = time.time()
+    return data
+
+# A client that hasn't acknowledged an update within this many seconds is
+# sent the latest one anyway.
+CLIENT_ACK_TIMEOUT = float(os.environ.get("CLIENT_ACK_TIMEOUT", 30))
+CLIENT_MAX_UPDATE_INTERVAL = 60
+
+class ClientState:
+    __slots__ = ("interval", "sent_seq", "sent_at", "in_flight")
+
+    def __init__(self):
+        self.interval = 0.0
+        self.sent_seq = 0
+        self.sent_at = 0.0
+        self.in_flight = False
+
+class UpdateFanout:
+    """Per-client delivery of the latest snapshot.
+
+    Every client has at most one update in flight. Newer snapshots are not
+    queued behind an unacknowledged one; the client gets whatever is latest
+    once it acks. A slow client therefore skips updates instead of piling
+    them up in its send buffer, and the only payload kept is the current
+    one, encoded once and shared by all clients.
+    """
+
+    def __init__(self):
+        self.clients = {}
+        self.payload = None
+        self.seq = 0
+        self._lock = threading.Lock()
+
+    def publish(self, data, now):
+        """Store a new snapshot; return the sids it should go to right away."""
+        payload = encode_update(data)
+        with self._lock:
+            self.payload = payload
+            self.seq = data["seq"]
+            return [sid for sid, state in self.clients.items() if self._take(state, now)]
+
+    def connect(self, sid, now):
+        with self._lock:
+            state = self.clients[sid] = ClientState()
+            return self._take(state, now)
+
+    def disconnect(self, sid):
+        with self._lock:
+            self.clients.pop(sid, None)
+
+    def ack(self, sid, seq, now):
+        """Record an ack; return whether the client is due the latest update."""
+        with self._lock:
+            state = self.clients.get(sid)
+            if state is None or seq != state.sent_seq:
+                return False
+            state.in_flight = False
+            return self._take(state, now)
+
+    def set_interval(self, sid, interval, now):
+        with self._lock:
+            state = self.clients.get(sid)
+            if state is None:
+                return False
+            state.interval = min(max(interval, 0.0), CLIENT_MAX_UPDATE_INTERVAL)
+            return self._take(state, now)
+
+    def _take(self, state, now):
+        # Mark the client as sent the latest payload if it is due one
+        if self.payload is None or state.sent_seq == self.seq:
+            return False
+        if state.in_flight and now - state.sent_at < CLIENT_ACK_TIMEOUT:
+            return False
+        if now - state.sent_at < state.interval:
+            return False
+        state.in_flight = True
+        state.sent_seq = self.seq
+        state.sent_at = now
+        return True
+
+fanout = UpdateFanout()
+
+def cycle_delay(started):
+    # Broadcasts start every UPDATE_INTERVAL however long collecting and
+    # sending took; a cycle that overran is followed by the next at once.
+    return max(UPDATE_INTERVAL - (time.monotonic() - started), 0)
+
+def requested_interval(data):
+    # set_update_interval payload: {"interval": seconds}, 0 for every update
+    try:
+        return float((data or {}).get("interval", 0))
+    except (AttributeError, TypeError, ValueError):
+        return 0.0
+
+if MONITOR_RUNTIME == "asgi":
+    async def background_task_async():
+        global latest_data
+        async with httpx.AsyncClient(base_url=FLAMENCO_API_URL, timeout=5) as client:
+            while True:
+                started = time.monotonic()
+                data = await collect_job_data_async(client)
+                data['farm_status'] = await aget_farm_status(client)
+                latest_data = stamp_update(data)
+                # Emitted side by side, so a big audience doesn't stretch the cycle
+                await asyncio.gather(*(send_update(sid) for sid in fanout.publish(data, time.monotonic())))
+                await sio.sleep(cycle_delay(started))
+
+    async def preview_task_async():
+        # Frames come from the Manager with long timeouts, so they are
+        # fetched here rather than in the broadcast cycle.
+        while True:
+            due = preview_cache.due(time.monotonic())
+            await asyncio.gather(*(asyncio.to_thread(refresh_preview, *args) for args in due))
+            await sio.sleep(PREVIEW_REFRESH_INTERVAL)
+
+    async def send_update(sid):
+        seq = fanout.seq
+        async def on_ack(*args):
+            if fanout.ack(sid, seq, time.monotonic()):
+                await send_update(sid)
+        await sio.emit("progress_update", fanout.payload, to=sid, callback=on_ack)
+
+    @sio.event
+    async def connect(sid, environ):
+        if fanout.connect(sid, time.monotonic()):
+            await send_update(sid)
+
+    @sio.event
+    async def disconnect(sid):
+        fanout.disconnect(sid)
+
+    @sio.event
+    async def set_update_interval(sid, data):
+        if fanout.set_interval(sid, requested_interval(data), time.monotonic()):
+            await send_update(sid)
+
+    def start_background_task():
+        sio.start_background_task(background_task_async)
+        sio.start_background_task(preview_task_async)
+
+    # Flask routes block (log downloads, Manager calls, file reads), so each
+    # request gets a thread from a pool rather than one shared thread.
+    asgi_app = python_socketio.ASGIApp(sio, other_asgi_app=WSGIMiddleware(app, workers=WSGI_THREADS),
+                                       on_startup=start_background_task)
+else:
+    def background_thread():
+        global latest_data
+        while True:
+            started = time.monotonic()
+            data = collect_job_data()
+            data['farm_status'] = get_farm_status()
+            latest_data = stamp_update(data)
+            for sid in fanout.publish(data, time.monotonic()):
+                send_update(sid)
+            socketio.sleep(cycle_delay(started))
+
+    def preview_thread():
+        # Frames come from the Manager with long timeouts, so they are
+        # fetched here rather than in the broadcast cycle.
+        preview_pool = eventlet.GreenPool(LOG_FETCH_CONCURRENCY)
+        while True:
+            for _ in preview_pool.starmap(refresh_preview, preview_cache.due(time.monotonic())):
+                pass
+            socketio.sleep(PREVIEW_REFRESH_INTERVAL)
+
+    def send_update(sid):
+        seq = fanout.seq
+        def on_ack(*args):
+            if fanout.ack(sid, seq, time.monotonic()):
+                send_update(sid)
+        socketio.emit("progress_update", fanout.payload, to=sid, callback=on_ack)
+
+    @socketio.on('connect')
+    def on_connect():
+        if fanout.connect(request.sid, time.monotonic()):
+            send_update(request.sid)
+
+    @socketio.on('disconnect')
+    def on_disconnect(*args):
+        fanout.disconnect(request.sid)
+
+    @socketio.on('set_update_interval')
+    def on_set_update_interval(data):
+        if fanout.set_interval(request.sid, requested_interval(data), time.monotonic()):
+            send_update(request.sid)
 
 TEMPLATE = """
 <!DOCTYPE html>
 <html>
 <head>
     <title>Flamenco Live Monitor</title>
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/socket.io/4.7.5/socket.io.min.js"></script>
-    <link rel="icon" type="image/svg+xml" href="{{ url_for('static', filename='favicon.svg') }}">
-    <style>
-        body {
-            background: #222;
-            color: #e0e0e0;
-            font-family: Segoe UI, Arial, sans-serif;
-            margin: 0; padding: 0;
-        }
-        .main-flex {
-            display: flex;
-            flex-direction: row;
-            align-items: stretch;
-            min-height: 100vh;
-            max-width: 1600px;
-            margin: 0 auto;
-        }
-        .workers-sidebar,
-        .completed-sidebar {
-            width: 340px;
-            background: #222329;
-            border-radius: 0 12px 12px 0;
-            box-sizing: border-box;
-            box-shadow: 2px 0 16px #0004;
-            position: fixed;
-            top: 0;
-            height: 100vh;
-            z-index: 10;
-            overflow-y: auto;
-            padding: 22px 12px 30px 18px;
-            border-right: 1.5px solid #363646;
-        }
-        .workers-sidebar {
-            left: 0;
-            border-radius: 0 12px 12px 0;
-            border-right: 1.5px solid #363646;
-        }
-        .completed-sidebar {
-            right: 0;
-            border-radius: 12px 0 0 12px;
-            border-left: 1.5px solid #363646;
-            border-right: none;
-            padding: 22px 18px 30px 12px;
-            box-shadow: -2px 0 16px #0004;
-        }
-        .workers-title, .completed-title {
-            font-size: 1.20em;
-            margin-bottom: 15px;
-            color: #a7ebfa;
-            letter-spacing: 0.07em;
-            font-weight: 500;
-            text-align: left;
-        }
-        .worker-entry {
-            background: #29293a;
-            border-radius: 7px;
-            margin-bottom: 12px;
-            box-shadow: 0 2px 7px #0002;
-            transition: background 0.18s;
-        }
-        .worker-header {
-            display: flex;
-            align-items: center;
-            cursor: pointer;
-            padding: 13px 10px 13px 10px;
-            border-radius: 7px;
-            transition: background 0.15s;
-        }
-        .worker-header:hover {
-            background: #2e3950;
-        }
-        .worker-name {
-            font-weight: 600;
-            font-size: 1.08em;
-            margin-right: 18px;
-        }
-        .worker-status {
-            font-size: 1em;
-            font-family: monospace;
-            margin-right: 16px;
-            padding: 1px 9px 1px 8px;
-            border-radius: 8px;
-            background: #1b212b;
-            color: #80ffd2;
-            font-weight: 500;
-        }
-        .worker-status.awake { color: #73ff7a; background: #223d1e; }
-        .worker-status.offline { color: #ff7878; background: #341d1d; }
-        .worker-status.idle { color: #fff49a; background: #32320f; }
-        .worker-status.busy { color: #7ad1ff; background: #182340; }
-        .worker-version {
-            font-size: 0.97em;
-            color: #8ef2f3;
-        }
-        .worker-toggle-arrow {
-            font-size: 1.45em;
-            color: #79e6fa;
-            margin-right: 10px;
-        }
-        .worker-details {
-            background: #1c1c25;
-            border-radius: 0 0 7px 7px;
-            padding: 13px 15px 10px 31px;
-            margin-bottom: 2px;
-            font-size: 0.99em;
-            color: #eee;
-            box-shadow: 0 2px 7px #0001;
-        }
-        .worker-details-row {
-            margin-bottom: 5px;
-            font-family: monospace;
-        }
-        .container {
-            flex: 1;
-            max-width: 1100px;
-            margin: 40px auto;
-            background: #292929;
-            border-radius: 8px;
-            box-shadow: 0 4px 20px #000a;
-            padding: 32px;
-            margin-left: 360px; /* space for left sidebar */
-            margin-right: 360px; /* space for right sidebar */
-            min-height: 100vh;
-        }
-        .status-bar {
-            width: 410px;
-            margin: 26px auto 0 auto;
-            text-align: center;
-            font-size: 1.18em;
-            border-radius: 12px;
-            box-shadow: 0 3px 14px #0006;
-            background: #18191a;
-            padding: 14px 0 11px 0;
-            letter-spacing: 0.04em;
-        }
-        .status-red { color: #ff2b2b; font-weight: bold; }
-        .status-yellow { color: #ffdb37; font-weight: bold; }
-        .status-green { color: #7bf178; font-weight: bold; }
-        .status-orange { color: #ff9800; font-weight: bold; }
-        h2 { margin-bottom: 24px; }
-        .job-block {
-            margin-bottom: 38px;
-            padding: 24px;
-            background: #232323;
-            border-radius: 7px;
-            box-shadow: 0 2px 9px #0006;
-        }
-        .progress-bar-bg {
-            width: 380px;
-            height: 28px;
-            background: #333;
-            border-radius: 10px;
-            overflow: hidden;
-            display: inline-block;
-            vertical-align: middle;
-            margin-right: 8px;
-        }
-        .progress-bar {
-            height: 100%;
-            background: linear-gradient(90deg, #27e2f3, #1db385 82%, #58f7b5);
-            border-radius: 8px;
-            transition: width 0.7s cubic-bezier(.44,.15,.28,1.11);
-        }
-        .progress-label {
-            font-size: 1.08em;
-            font-family: monospace;
-            color: #afffd3;
-            margin-left: 12px;
-            vertical-align: middle;
-        }
-        .tile-label {
-            font-size: 0.98em;
-            color: #ffb97e;
-            margin-left: 10px;
-            vertical-align: middle;
-            font-family: monospace;
-        }
-        .time-remaining-label {
-            font-size: 0.97em;
-            color: #96f797;
-            margin-left: 14px;
-            vertical-align: middle;
-            font-family: monospace;
-        }
-        .task-table, .completed-task-table {
-            width: 99%;
-            border-collapse: collapse;
-            margin-top: 18px;
-        }
-        .task-table th, .task-table td, .completed-task-table th, .completed-task-table td {
-            padding: 8px 12px;
-            border-bottom: 1px solid #353535;
-        }
-        .task-table th {
-            background: #232840;
-            color: #7cd7ff;
-            cursor: pointer;
-            user-select: none;
-        }
-        .task-table tr:last-child td { border-bottom: none; }
-        .log-link { color: #53e7fc; text-decoration: underline; }
-        .completed-job-list-item {
-            background: #27283a;
-            border-radius: 8px;
-            padding: 13px 9px 13px 13px;
-            margin-bottom: 11px;
-            cursor: pointer;
-            transition: background 0.15s;
-            box-shadow: 0 1px 7px #0002;
-            display: flex;
-            flex-direction: column;
-        }
-        .completed-job-list-item:hover {
-            background: #25315a;
-        }
-        .completed-title {
-            margin-bottom: 13px;
-        }
-        .completed-job-list-name {
-            font-size: 1.09em;
-            font-weight: 600;
-        }
-        .completed-job-list-id {
-            font-size: 0.97em;
-            color: #98e6ff;
-            margin-left: 5px;
-        }
-        .completed-job-list-status {
-            font-size: 0.99em;
-            color: #ffd96d;
-            margin-left: 7px;
-        }
-        .completed-job-list-time {
-            font-size: 0.98em;
-            color: #aeffae;
-            margin-left: 5px;
-        }
-        .completed-task-table th {
-            background: #243248;
-            color: #6bc9f3;
-        }
-
-        /* Modal styles */
-        .modal-overlay {
-            display: none;
-            position: fixed;
-            z-index: 10001;
-            left: 0;
-            top: 0;
-            width: 100vw;
-            height: 100vh;
-            background: rgba(20, 20, 40, 0.88);
-        }
-        .modal-overlay.active {
-            display: block;
-        }
-        .modal-dialog {
-            position: absolute;
-            top: 50%;
-            left: 50%;
-            transform: translate(-50%, -50%);
-            min-width: 420px;
-            min-height: 200px;
-            background: #242637;
-            border-radius: 15px;
-            box-shadow: 0 9px 48px #000c;
-            padding: 35px 35px 30px 35px;
-            max-width: 850px;
-            width: 90vw;
-            max-height: 88vh;
-            overflow-y: auto;
-            color: #fff;
-        }
-        .modal-close {
-            position: absolute;
-            top: 15px;
-            right: 23px;
-            font-size: 2.1em;
-            font-weight: 800;
-            color: #b4f4fa;
-            cursor: pointer;
-            z-index: 9999;
-            transition: color 0.18s;
-        }
-        .modal-close:hover { color: #ff7b7b; }
-        .modal-job-header {
-            font-size: 1.25em;
-            font-weight: bold;
-            margin-bottom: 8px;
-            display: flex;
-            align-items: center;
-            gap: 12px;
-        }
-        .modal-job-id {
-            font-size: 0.98em;
-            color: #99f1f6;
-        }
-        .modal-job-status {
-            font-size: 0.98em;
-            color: #ffd96d;
-        }
-        .modal-job-time {
-            font-size: 0.97em;
-            color: #aeffae;
-        }
-        .modal-tasks-label {
-            margin-top: 16px;
-            font-size: 1.08em;
-            font-weight: 600;
-            color: #9be0fd;
-            margin-bottom: 5px;
-        }
-        @media (max-width:1200px) {
-            .main-flex { flex-direction: column; }
-            .workers-sidebar, .completed-sidebar {
-                position: static;
-                width: 99%;
-                border-radius: 0 0 12px 12px;
-                height: auto;
-                min-height: 0;
-                margin-bottom: 10px;
-            }
-            .container { margin-left: 0; margin-right: 0; }
-            .modal-dialog { min-width: 98vw; padding: 15px; }
-        }
-        @media (max-width: 500px) {
-            .modal-dialog { min-width: 98vw; font-size: 0.96em; }
-        }
-    </style>
+    <link rel="icon" type="image/svg+xml" href="{{ asset_url('favicon.svg') }}">
+    <link rel="stylesheet" href="{{ asset_url('monitor.css') }}">
 </head>
-<body>
+<body data-farm-status="{{ farm_status }}">
     <div id="farm-status" class="status-bar"></div>
     <div class="main-flex">
         <div class="workers-sidebar">
@@ -684,10 +1731,23 @@ TEMPLATE = """
         </div>
         <div class="container">
             <h2>Flamenco Jobs & Task Progress <span id="updating" style="font-size:0.7em; color:#6f8;">(Live)</span></h2>
+            <form class="log-search" onsubmit="searchLogs(event)">
+                <input type="search" id="log-search-input" placeholder="Search task logs, e.g. CUDA error">
+                <button type="submit">Search</button>
+            </form>
+            <div id="search-results" class="search-results"></div>
             <div id="jobs-list"></div>
         </div>
         <div class="completed-sidebar">
-            <div class="completed-title">Last 10 Completed Jobs</div>
+            <div class="completed-title">Last
+                <select id="completed-limit" onchange="setCompletedLimit(this.value)">
+                    <option value="5">5</option>
+                    <option value="10" selected>10</option>
+                    <option value="25">25</option>
+                    <option value="50">50</option>
+                    <option value="100">100</option>
+                </select>
+                Completed Jobs</div>
             <div id="completed-jobs-list"></div>
         </div>
     </div>
@@ -699,265 +1759,20 @@ TEMPLATE = """
             <div id="completed-job-modal-content"></div>
         </div>
     </div>
-    <script>
-        function updateFarmStatusBox(farmStatus) {
-            let colorClass = "status-yellow";
-            let label = farmStatus.charAt(0).toUpperCase() + farmStatus.slice(1);
-            if (farmStatus.toLowerCase() === "inoperative") {
-                colorClass = "status-red";
-            } else if (farmStatus.toLowerCase() === "idle") {
-                colorClass = "status-yellow";
-            } else if (farmStatus.toLowerCase() === "active") {
-                colorClass = "status-green";
-            } else if (farmStatus.toLowerCase() === "waiting") {
-                colorClass = "status-orange";
-            } else if (farmStatus.toLowerCase() === "unavailable") {
-                colorClass = "status-red";
-                label = "Unavailable";
-            }
-            document.getElementById("farm-status").innerHTML =
-              `Farm Status: <span class="${colorClass}">${label}</span>`;
-        }
-        updateFarmStatusBox("{{ farm_status }}");
-
-        var taskSortingState = {};
-        var completedDropdownState = {};
-        var lastJobsData = [];
-        var workersDropdownState = {};
-        var lastCompletedJobs = [];
-
-        function createProgressBar(pct, width=200, height=16) {
-            return `<div class="progress-bar-bg" style="width:${width}px;height:${height}px;">
-                <div class="progress-bar" style="width:${pct}%;"></div>
-            </div>`;
-        }
-        function getSortedClass(state, col) {
-            if (state.field !== col) return "";
-            return state.asc ? "sorted-asc" : "sorted-desc";
-        }
-        function sortTasks(tasks, state) {
-            if (!state || !state.field || state.field === "default") return tasks;
-            let key = state.field;
-            let asc = state.asc;
-            let cmp = (a, b) => {
-                if (key === "progress_pct") return (asc ? 1 : -1) * (a.progress_pct - b.progress_pct);
-                let av = (a[key] || "").toString().toLowerCase();
-                let bv = (b[key] || "").toString().toLowerCase();
-                if (av === bv) return 0;
-                return asc ? (av < bv ? -1 : 1) : (av > bv ? -1 : 1);
-            };
-            return [...tasks].sort(cmp);
-        }
-        function renderTaskRows(tasks, jobId, state) {
-            let sorted = sortTasks(tasks, state);
-            return sorted.map(function(task) {
-                return `<tr>
-                    <td>${task.task_name}</td>
-                    <td>${task.status}</td>
-                    <td>
-                        ${createProgressBar(task.progress_pct, 160, 14)}
-                        <span class="progress-label">${task.progress_pct}%</span>
-                        ${
-                            task.tile_info && task.tile_info !== "" ?
-                            `<span class="tile-label">${task.tile_info}</span>` : ""
-                        }
-                        ${
-                            task.step_label && task.step_label !== "" ?
-                            `<span class="step-label">${task.step_label}</span>` : ""
-                        }
-                        ${
-                            task.time_remaining && task.time_remaining !== "" ?
-                            `<span class="time-remaining-label">ETA:${task.time_remaining}</span>` : ""
-                        }
-                    </td>
-                    <td>
-                        <a class="log-link" href="${task.log_url}" target="_blank">Log File</a>
-                    </td>
-                </tr>`;
-            }).join("");
-        }
-        function toggleTaskSorting(jobId, col) {
-            let state = taskSortingState[jobId] || {field: "default", asc: true};
-            if (state.field === col) {
-                state.asc = !state.asc;
-            } else {
-                state.field = col;
-                state.asc = true;
-            }
-            taskSortingState[jobId] = state;
-            let job = lastJobsData.find(j => j.job_id === jobId);
-            if (job) {
-                let tableBody = document.querySelector(`#task-table-${jobId} tbody`);
-                tableBody.innerHTML = renderTaskRows(job.tasks, jobId, state);
-            }
-            ['task_name', 'status', 'progress_pct', 'log_url'].forEach(colName => {
-                let th = document.getElementById(`th-${colName}-${jobId}`);
-                if (th) th.className = getSortedClass(state, colName);
-            });
-        }
-        function renderJobs(jobs) {
-            lastJobsData = jobs;
-            let html = '';
-            jobs.forEach(function(job) {
-                html += `<div class="job-block">
-                    <div style="margin-bottom:9px;">
-                        <b style="font-size:1.1em;">${job.job_name}</b>
-                        <span style="font-size:0.97em;color:#9de0fd;">[${job.job_id}]</span>
-                        <span style="font-size:0.93em;color:#ffd;"> (${job.n_tasks_completed}/${job.n_tasks} tasks completed)</span>
-                    </div>
-                    <div style="margin-bottom:18px;">
-                        ${createProgressBar(job.job_progress_pct, 380, 28)}
-                        <span class="progress-label">${job.job_progress_pct}%</span>
-                    </div>
-                    <table class="task-table" id="task-table-${job.job_id}">
-                        <thead>
-                            <tr>
-                                <th id="th-task_name-${job.job_id}" onclick="toggleTaskSorting('${job.job_id}','task_name')">Task Name</th>
-                                <th id="th-status-${job.job_id}" onclick="toggleTaskSorting('${job.job_id}','status')">Status</th>
-                                <th id="th-progress_pct-${job.job_id}" onclick="toggleTaskSorting('${job.job_id}','progress_pct')">Render Progress</th>
-                                <th id="th-log_url-${job.job_id}" onclick="toggleTaskSorting('${job.job_id}','log_url')">Log File</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-                            ${renderTaskRows(job.tasks, job.job_id, taskSortingState[job.job_id])}
-                        </tbody>
-                    </table>
-                </div>`;
-            });
-            document.getElementById("jobs-list").innerHTML = html;
-        }
-
-        // Modal popup for completed jobs
-        function renderCompletedJobs(jobs) {
-            lastCompletedJobs = jobs;
-            let html = '';
-            jobs.forEach(function(job, idx) {
-                html += `
-                    <div class="completed-job-list-item" onclick="showCompletedJobModal(${idx})">
-                        <span>
-                            <span class="completed-job-list-name">${job.job_name}</span>
-                            <span class="completed-job-list-id">[${job.job_id}]</span>
-                        </span>
-                        <span>
-                            <span class="completed-job-list-status">${job.job_status || ''}</span>
-                            <span class="completed-job-list-time">${job.completed_time ? 'Completed: ' + job.completed_time : ''}</span>
-                        </span>
-                    </div>
-                `;
-            });
-            document.getElementById("completed-jobs-list").innerHTML = html;
-        }
-
-        function showCompletedJobModal(idx) {
-            var job = lastCompletedJobs[idx];
-            if (!job) return;
-            let modalContent = `
-                <div class="modal-job-header">
-                    <span>${job.job_name}</span>
-                    <span class="modal-job-id">[${job.job_id}]</span>
-                    <span class="modal-job-status">${job.job_status || ''}</span>
-                    <span class="modal-job-time">${job.completed_time ? 'Completed: ' + job.completed_time : ''}</span>
-                </div>
-                <div class="modal-tasks-label">Tasks</div>
-                <table class="completed-task-table">
-                    <thead>
-                        <tr>
-                            <th>Task Name</th>
-                            <th>Status</th>
-                            <th>Render Progress</th>
-                            <th>Log File</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                    ${
-                        job.tasks.map(function(task) {
-                            return `<tr>
-                                <td>${task.task_name}</td>
-                                <td>${task.status}</td>
-                                <td>
-                                    ${createProgressBar(task.progress_pct, 160, 14)}
-                                    <span class="progress-label">${task.progress_pct}%</span>
-                                    ${
-                                        task.tile_info && task.tile_info !== "" ?
-                                        `<span class="tile-label">${task.tile_info}</span>` : ""
-                                    }
-                                    ${
-                                        task.step_label && task.step_label !== "" ?
-                                        `<span class="step-label">${task.step_label}</span>` : ""
-                                    }
-                                    ${
-                                        task.time_remaining && task.time_remaining !== "" ?
-                                        `<span class="time-remaining-label">ETA:${task.time_remaining}</span>` : ""
-                                    }
-                                </td>
-                                <td>
-                                    <a class="log-link" href="${task.log_url}" target="_blank">Log File</a>
-                                </td>
-                            </tr>`;
-                        }).join('')
-                    }
-                    </tbody>
-                </table>
-            `;
-            document.getElementById('completed-job-modal-content').innerHTML = modalContent;
-            document.getElementById('completed-job-modal-overlay').classList.add('active');
-        }
-        window.showCompletedJobModal = showCompletedJobModal;
-
-        function closeCompletedJobModal(event) {
-            document.getElementById('completed-job-modal-overlay').classList.remove('active');
-        }
-        window.closeCompletedJobModal = closeCompletedJobModal;
-
-        // WORKERS PANEL LOGIC
-        function renderWorkers(workers) {
-            let html = '';
-            workers.forEach(function(worker, idx) {
-                let dropdownId = 'worker-dropdown-' + idx;
-                let isOpen = workersDropdownState[dropdownId] || false;
-                html += `<div class="worker-entry">
-                    <div class="worker-header" onclick="toggleWorkerDropdown('${dropdownId}')">
-                        <span class="worker-toggle-arrow" id="worker-arrow-${dropdownId}">${isOpen ? '▼' : '►'}</span>
-                        <span class="worker-name">${worker.name || '(Unnamed)'}</span>
-                        <span class="worker-status ${worker.status.toLowerCase()}">${worker.status}</span>
-                        <span class="worker-version">v${worker.version || '-'}</span>
-                    </div>
-                    <div class="worker-details" id="${dropdownId}" style="display:${isOpen ? 'block' : 'none'};">
-                        <div class="worker-details-row"><b>ID:</b> <span>${worker.id}</span></div>
-                        <div class="worker-details-row"><b>Status:</b> <span>${worker.status}</span></div>
-                        <div class="worker-details-row"><b>Version:</b> <span>${worker.version}</span></div>
-                        <div class="worker-details-row"><b>Can Restart:</b> <span>${worker.can_restart}</span></div>
-                        <div class="worker-details-row"><b>Last Seen:</b> <span>${worker.last_seen}</span></div>
-                    </div>
-                </div>`;
-            });
-            document.getElementById("workers-list").innerHTML = html;
-        }
-        function toggleWorkerDropdown(dropdownId) {
-            workersDropdownState[dropdownId] = !workersDropdownState[dropdownId];
-            let el = document.getElementById(dropdownId);
-            let arrow = document.getElementById("worker-arrow-" + dropdownId);
-            if (el && arrow) {
-                el.style.display = workersDropdownState[dropdownId] ? 'block' : 'none';
-                arrow.innerHTML = workersDropdownState[dropdownId] ? '▼' : '►';
-            }
-        }
-        window.toggleWorkerDropdown = toggleWorkerDropdown;
-
-        var socket = io();
-        socket.on('progress_update', function(data) {
-            renderJobs(data.jobs || []);
-            renderCompletedJobs(data.completed_jobs || []);
-            renderWorkers(data.workers || []);
-            if (data.farm_status) {
-                updateFarmStatusBox(data.farm_status);
-            }
-        });
-    </script>
+    <script src="{{ asset_url('vendor/socket.io.min.js') }}"></script>
+    <script src="{{ asset_url('monitor.js') }}"></script>
 </body>
 </html>
 """
 
+# Compiled once; index() renders it once per farm status and keeps the result
+index_template = app.jinja_env.from_string(TEMPLATE)
+
 if __name__ == "__main__":
-    socketio.start_background_task(target=background_thread)
-    socketio.run(app, host="0.0.0.0", port=5000, debug=True)
+    if MONITOR_RUNTIME == "asgi":
+        import uvicorn
+        uvicorn.run(asgi_app, host=MONITOR_HOST, port=MONITOR_PORT, log_level="debug" if DEBUG else "info")
+    else:
+        socketio.start_background_task(target=background_thread)
+        socketio.start_background_task(target=preview_thread)
+        socketio.run(app, host=MONITOR_HOST, port=MONITOR_PORT, debug=DEBUG)
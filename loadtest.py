@@ -0,0 +1,415 @@
+"""Load test for the monitor's socket.io update fan-out.
+
+Starts a synthetic Flamenco Manager, runs flamenco_monitor against it and
+connects growing numbers of simulated dashboard clients. For every client
+count it records emit-to-receive latency percentiles, missed and late
+updates, and the monitor's CPU and memory use per client, and writes
+everything as JSON.
+
+    python loadtest.py --runtime eventlet,asgi --clients 10,100,500 -o loadtest.json
+
+Besides the monitor's own requirements this needs the asyncio socket.io
+client: pip install "python-socketio[asyncio_client]". CPU and memory are
+read from /proc, so it only runs on Linux.
+
+With --ack-delay the clients acknowledge updates slowly. The monitor then
+skips updates for them (counted as missed) instead of buffering them, and
+server memory per client should stay flat.
+"""
+import argparse
+import asyncio
+import io
+import json
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+# ---- Synthetic Flamenco Manager -------------------------------------------
+
+class SyntheticManagerHandler(BaseHTTPRequestHandler):
+    """Answers the Manager API calls the monitor makes with generated jobs.
+
+    Every task of the first job is active and its log grows a Cycles tile
+    line per second, so the monitor exercises its whole log pipeline. The
+    first job also renders a new frame every FRAME_SECONDS, which keeps
+    the preview thumbnails busy (only if Pillow is installed to draw it).
+    """
+    FRAME_SECONDS = 10
+    n_jobs = 3
+    n_tasks = 20
+    n_workers = 10
+    started = time.time()
+    _frame = None
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, obj):
+        body = json.dumps(obj).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def jobs(self, statuses):
+        frame = int(time.time() - self.started) // self.FRAME_SECONDS
+        jobs = [
+            {"id": f"job{j:04d}-0000", "name": f"shot{j:03d}", "status": "active" if j == 0 else "queued",
+             "updated": f"2026-01-01T00:{frame // 60 % 60:02d}:{frame % 60:02d}Z" if j == 0 else "2026-01-01T00:00:00Z"}
+            for j in range(self.n_jobs)
+        ]
+        jobs += [
+            {"id": f"done{j:04d}-0000", "name": f"old{j:03d}", "status": "completed",
+             "updated": f"2026-01-{j % 28 + 1:02d}T00:00:00Z"}
+            for j in range(15)
+        ]
+        return [job for job in jobs if job["status"] in statuses]
+
+    def tasks(self, job_id):
+        active = job_id.startswith("job0000")
+        return [
+            {"id": f"{job_id[:7]}-task{t:04d}", "name": f"render-{t * 10 + 1}-{t * 10 + 10}",
+             "status": "active" if active else ("completed" if job_id.startswith("done") else "queued"),
+             "task_type": "blender", "worker": {"id": f"worker{t % self.n_workers:03d}"}}
+            for t in range(self.n_tasks)
+        ]
+
+    def log(self):
+        lines = int(time.time() - self.started) + 1
+        return "".join(
+            f"Fra:1 Mem:100M | Time:00:{i % 60:02d}.00 | Remaining:00:10.00 | Scene, View Layer | "
+            f"Rendered {i % 64}/64 Tiles, Sample 1/128\n"
+            for i in range(lines)
+        ).encode()
+
+    @classmethod
+    def frame(cls):
+        # A full HD render, drawn once; None without Pillow
+        if cls._frame is None:
+            try:
+                from PIL import Image
+            except ImportError:
+                return None
+            buf = io.BytesIO()
+            Image.new("RGB", (1920, 1080), (40, 90, 160)).save(buf, "JPEG", quality=90)
+            cls._frame = buf.getvalue()
+        return cls._frame
+
+    def do_GET(self):
+        path = self.path
+        if path == "/api/v3/status":
+            return self.send_json({"status": "active"})
+        if path == "/api/v3/worker-mgt/workers":
+            return self.send_json({"workers": [
+                {"id": f"worker{w:03d}", "name": f"node{w:03d}", "status": "awake", "version": "3.5",
+                 "can_restart": False, "last_seen": "2026-01-01T00:00:00Z"}
+                for w in range(self.n_workers)
+            ]})
+        if path.startswith("/api/v3/jobs/") and path.endswith("/tasks"):
+            return self.send_json({"tasks": self.tasks(path.split("/")[4])})
+        if path.startswith("/api/v3/tasks/"):
+            return self.send_json({"id": path.rsplit("/", 1)[1], "status": "completed"})
+        if path.startswith("/api/v3/jobs/") and path.endswith("/last-rendered"):
+            job_id = path.split("/")[4]
+            if not job_id.startswith("job0000") or self.frame() is None:
+                self.send_response(204)
+                self.end_headers()
+                return
+            return self.send_json({"base": f"/job-files/job-{job_id[:4]}/{job_id}/last-rendered",
+                                   "suffixes": ["last-rendered.jpg", "last-rendered-small.jpg"]})
+        if path.startswith("/job-files/") and path.endswith(".jpg"):
+            body = self.frame()
+            self.send_response(200)
+            self.send_header("Content-Type", "image/jpeg")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if path.startswith("/job-files/"):
+            data = self.log()
+            start = 0
+            if self.headers.get("Range"):
+                start = int(self.headers["Range"][6:].split("-")[0])
+                if start >= len(data):
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{len(data)}")
+                    self.end_headers()
+                    return
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{len(data) - 1}/{len(data)}")
+            else:
+                self.send_response(200)
+            self.send_header("Content-Length", str(len(data) - start))
+            self.end_headers()
+            self.wfile.write(data[start:])
+            return
+        self.send_response(404)
+        self.end_headers()
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path == "/api/v3/jobs/query":
+            return self.send_json({"jobs": self.jobs(json.loads(body).get("status_in", []))})
+        self.send_response(404)
+        self.end_headers()
+
+
+def run_synthetic_manager(port, n_jobs, n_tasks, n_workers):
+    SyntheticManagerHandler.n_jobs = n_jobs
+    SyntheticManagerHandler.n_tasks = n_tasks
+    SyntheticManagerHandler.n_workers = n_workers
+    SyntheticManagerHandler.started = time.time()
+    ThreadingHTTPServer(("127.0.0.1", port), SyntheticManagerHandler).serve_forever()
+
+
+# ---- Monitor process -------------------------------------------------------
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_monitor(runtime, port, manager_port, cache_dir, interval):
+    env = dict(
+        os.environ,
+        MONITOR_RUNTIME=runtime,
+        MONITOR_HOST="127.0.0.1",
+        MONITOR_PORT=str(port),
+        FLAMENCO_SERVER=f"127.0.0.1:{manager_port}",
+        LOG_CACHE_DIR=os.path.join(cache_dir, "logs"),
+        PREVIEW_CACHE_DIR=os.path.join(cache_dir, "previews"),
+        UPDATE_INTERVAL=str(interval),
+        PYTHONWARNINGS="ignore",
+    )
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "flamenco_monitor"], cwd=HERE, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=2).read()
+            return proc
+        except OSError:
+            time.sleep(0.3)
+    proc.kill()
+    raise RuntimeError(f"monitor ({runtime}) did not come up on port {port}")
+
+
+def process_tree(pid):
+    pids = [pid]
+    for p in pids:
+        try:
+            for task in os.listdir(f"/proc/{p}/task"):
+                with open(f"/proc/{p}/task/{task}/children") as f:
+                    pids.extend(int(c) for c in f.read().split())
+        except OSError:
+            pass
+    return pids
+
+
+def sample_usage(pid):
+    """CPU seconds and resident bytes of the monitor and its parse workers."""
+    cpu = 0.0
+    rss = 0
+    ticks = os.sysconf("SC_CLK_TCK")
+    for p in process_tree(pid):
+        try:
+            with open(f"/proc/{p}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            cpu += (int(fields[11]) + int(fields[12])) / ticks
+            with open(f"/proc/{p}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        rss += int(line.split()[1]) * 1024
+        except OSError:
+            pass
+    return cpu, rss
+
+
+# ---- Simulated dashboard clients -------------------------------------------
+
+# Clients stay connected this long after the window, so updates sent near
+# its end can still arrive rather than count as missed.
+RECEIVE_GRACE = 5
+
+
+def run_clients(job):
+    return asyncio.run(_run_clients(**job))
+
+
+async def _run_clients(url, n, measure_start, measure_end, late_after, ack_delay):
+    import socketio
+
+    connect_slots = asyncio.Semaphore(50)
+
+    async def one_client():
+        client = socketio.AsyncClient(reconnection=False)
+        received = []
+
+        async def on_update(data):
+            now = time.time()
+            if isinstance(data, (bytes, bytearray)):
+                data = json.loads(data)
+            # Updates belong to the window they were sent in
+            if measure_start <= data["sent_at"] <= measure_end:
+                received.append((data["seq"], now - data["sent_at"]))
+            if ack_delay:
+                # A slow consumer: the ack goes out when the handler returns
+                await asyncio.sleep(ack_delay)
+
+        client.on("progress_update", on_update)
+        try:
+            async with connect_slots:
+                await client.connect(url, transports=["websocket"], wait_timeout=20)
+        except Exception:
+            return None
+        await asyncio.sleep(max(measure_end - time.time(), 0) + RECEIVE_GRACE)
+        await client.disconnect()
+        return received
+
+    per_client = await asyncio.gather(*(one_client() for _ in range(n)))
+    # Misses are counted in measure(), against the seqs sent to any client
+    # in any process, so each connected client reports what it got.
+    stats = {"failed": 0, "received": 0, "late": 0, "latencies": [], "seqs": []}
+    for received in per_client:
+        if received is None:
+            stats["failed"] += 1
+            continue
+        stats["received"] += len(received)
+        stats["seqs"].append({seq for seq, _ in received})
+        for _, latency in received:
+            stats["latencies"].append(latency)
+            stats["late"] += latency > late_after
+    return stats
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(int(len(values) * pct / 100), len(values) - 1)]
+
+
+def measure(runtime, port, monitor_pid, n_clients, args):
+    ramp = max(5.0, n_clients / 100)
+    measure_start = time.time() + ramp
+    measure_end = measure_start + args.duration
+    shares = [n_clients // args.client_processes + (i < n_clients % args.client_processes)
+              for i in range(args.client_processes)]
+    jobs = [dict(url=f"http://127.0.0.1:{port}", n=n, measure_start=measure_start,
+                 measure_end=measure_end, late_after=args.interval, ack_delay=args.ack_delay)
+            for n in shares if n]
+    with multiprocessing.Pool(len(jobs)) as pool:
+        pending = pool.map_async(run_clients, jobs)
+        idle_cpu, idle_rss = sample_usage(monitor_pid)
+        time.sleep(max(measure_start - time.time(), 0))
+        cpu_start, _ = sample_usage(monitor_pid)
+        time.sleep(max(measure_end - time.time(), 0))
+        cpu_end, rss = sample_usage(monitor_pid)
+        parts = pending.get()
+
+    latencies = [latency for part in parts for latency in part["latencies"]]
+    client_seqs = [seqs for part in parts for seqs in part["seqs"]]
+    connected = len(client_seqs)
+    all_seqs = set().union(*client_seqs)
+    updates_sent = max(all_seqs) - min(all_seqs) + 1 if all_seqs else 0
+    received = sum(part["received"] for part in parts)
+    # Every update of the run that a connected client didn't get is missed,
+    # including all of them for a client that got nothing at all.
+    missed = sum(updates_sent - len(seqs) for seqs in client_seqs)
+    late = sum(part["late"] for part in parts)
+    cpu_pct = (cpu_end - cpu_start) / args.duration * 100
+    p99 = percentile(latencies, 99)
+    return {
+        "runtime": runtime,
+        "clients": n_clients,
+        "connected": connected,
+        "connect_failures": sum(part["failed"] for part in parts),
+        "updates_sent": updates_sent,
+        "update_rate_hz": round(updates_sent / args.duration, 3),
+        "messages_received": received,
+        "messages_missed": missed,
+        "messages_late": late,
+        "latency_ms": {
+            name: round(value * 1000, 2) if value is not None else None
+            for name, value in (("p50", percentile(latencies, 50)), ("p90", percentile(latencies, 90)),
+                                ("p99", p99), ("max", max(latencies) if latencies else None))
+        },
+        "server_cpu_pct": round(cpu_pct, 1),
+        "server_cpu_pct_per_client": round(cpu_pct / connected, 4) if connected else None,
+        "server_rss_mb": round(rss / 2 ** 20, 1),
+        "server_rss_kb_per_client": round((rss - idle_rss) / 1024 / connected, 1) if connected else None,
+        # Holding the configured rate: every client connected, nothing
+        # missed, and 99% of updates arriving within one interval.
+        "sustained": (
+            connected == n_clients and missed == 0 and p99 is not None and p99 <= args.interval
+            and updates_sent >= 0.8 * args.duration / args.interval
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runtime", default="eventlet,asgi", help="comma-separated runtimes to test")
+    parser.add_argument("--clients", default="10,50,100,250,500", help="comma-separated client counts")
+    parser.add_argument("--duration", type=float, default=20, help="measured seconds per client count")
+    parser.add_argument("--interval", type=float, default=1, help="monitor update interval in seconds")
+    parser.add_argument("--ack-delay", type=float, default=0,
+                        help="seconds each client takes to acknowledge an update, to simulate slow consumers")
+    parser.add_argument("--jobs", type=int, default=3, help="synthetic jobs on the farm")
+    parser.add_argument("--tasks", type=int, default=20, help="synthetic tasks per job")
+    parser.add_argument("--workers", type=int, default=10, help="synthetic render workers")
+    parser.add_argument("--client-processes", type=int, default=max((os.cpu_count() or 2) // 2, 1),
+                        help="processes the simulated clients are spread over")
+    parser.add_argument("-o", "--output", help="write JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    manager_port = free_port()
+    manager = multiprocessing.Process(
+        target=run_synthetic_manager, args=(manager_port, args.jobs, args.tasks, args.workers), daemon=True)
+    manager.start()
+
+    results = []
+    for runtime in args.runtime.split(","):
+        port = free_port()
+        with tempfile.TemporaryDirectory() as cache_dir:
+            monitor = start_monitor(runtime, port, manager_port, cache_dir, args.interval)
+            try:
+                for n_clients in [int(n) for n in args.clients.split(",")]:
+                    result = measure(runtime, port, monitor.pid, n_clients, args)
+                    print(f"{runtime:8} {n_clients:6} clients: p99 {result['latency_ms']['p99']} ms, "
+                          f"missed {result['messages_missed']}, cpu {result['server_cpu_pct']}%, "
+                          f"rss {result['server_rss_mb']} MB, sustained={result['sustained']}", file=sys.stderr)
+                    results.append(result)
+            finally:
+                monitor.terminate()
+                monitor.wait(10)
+    manager.terminate()
+
+    report = {
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        "host": {"cpus": os.cpu_count(), "python": sys.version.split()[0]},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""Functions run in the monitor's parse process pool.
+
+The pool uses spawn, so every worker imports this module fresh. Keep it
+free of import-time side effects: no network, disk or server state, and
+nothing from flamenco_monitor. Progress parsers registered from other
+modules must be importable by the workers too.
+"""
+import io
+import os
+import re
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+TIME_REMAINING_RE = re.compile(r"Remaining:((?:\d{1,2}:)?\d{1,2}:\d{2}(?:\.\d{1,2})?)")
+TILE_RE = re.compile(r"Rendered\s+(\d+)\s*/\s*(\d+)\s+Tiles")
+PROGRESS_RE = re.compile(r"Rendered\s+(\d+)\s*/\s*(\d+)", re.IGNORECASE)
+BVH_RE = re.compile(r"Building BVH\s+(\d+)%")
+
+STEP_PATTERNS = [(re.compile(pat), label) for pat, label in [
+    (r"\|\s*Scene, View Layer \|\s*Synchronizing object \|\s*(.+)$", "Synchronizing object"),
+    (r"\|\s*Scene, View Layer \|\s*Synchronizing object$", "Synchronizing object"),
+    (r"\|\s*Scene, View Layer \|\s*Initializing$", "Initializing"),
+    (r"\|\s*Scene, View Layer \|\s*Waiting for render to start", "Waiting for render to start"),
+    (r"\|\s*Scene, View Layer \|\s*Loading render kernels", "Loading render kernels"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Scene$", "Updating Scene"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Shaders$", "Updating Shaders"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Procedurals$", "Updating Procedurals"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Background$", "Updating Background"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Camera$", "Updating Camera"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Meshes Flags$", "Updating Meshes Flags"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Objects Flags$", "Updating Objects Flags"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Meshes$", "Updating Meshes"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Particle Systems", "Updating Particle Systems"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Mesh \|\s*Computing normals", "Computing normals"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Mesh \|\s*Copying Mesh to device", "Copying Mesh to device"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Mesh \|\s*Copying Curves to device", "Copying Curves to device"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Mesh \|\s*Computing attributes", "Computing attributes"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Mesh \|\s*Copying Attributes to device", "Copying Attributes to device"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Mesh \|\s*Computing Displacement Mesh", "Computing Displacement Mesh"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Mesh \|\s*Updating Displacement Images", "Updating Displacement Images"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Geometry BVH.*?Building BVH", "Building BVH"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Scene BVH \|\s*Building", "Building Scene BVH"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Scene BVH \|\s*Building BVH", "Building Scene BVH"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Scene BVH \|\s*Copying BVH to device", "Copying BVH to device"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Objects \|\s*Copying Transformations to device", "Copying Transformations"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Objects \|\s*Applying Static Transformations", "Applying Static Transformations"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Particle Systems \|\s*Copying Particles to device", "Copying Particles to device"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Objects$", "Updating Objects"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Lights \|\s*Importance map", "Updating Lights Importance map"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Lights$", "Updating Lights"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Images$", "Updating Images"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Camera Volume$", "Updating Camera Volume"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Lookup Tables$", "Updating Lookup Tables"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Film$", "Updating Film"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Integrator$", "Updating Integrator"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Baking$", "Updating Baking"),
+    (r"\|\s*Scene, View Layer \|\s*Updating Device \|\s*Writing constant memory", "Writing constant memory"),
+    (r"\|\s*Scene, View Layer \|\s*Rendered \d+/\d+ Tiles, Sample \d+/\d+", "Rendering Tiles"),
+    (r"\|\s*Scene, View Layer \|\s*Finishing$", "Finishing"),
+    (r"\|\s*Scene, View Layer \|\s*Denoising$", "Denoising"),
+    (r"\|\s*Scene \|\s*Reading full buffer from disk", "Reading full buffer from disk"),
+    (r"\|\s*Scene, View Layer \|\s*Finished$", "Finished"),
+]]
+
+def parse_time_remaining(line):
+    m = TIME_REMAINING_RE.search(line)
+    if m:
+        return m.group(1)
+    return None
+
+def extract_render_step_and_tile(lines):
+    tile_info = ""
+    step_label = ""
+    latest_tile = None
+    latest_total = None
+    # Walk backwards so the first hit of each kind is the most recent one
+    for line in reversed(lines):
+        # Look for most recent tile render progress
+        if latest_tile is None:
+            m = TILE_RE.search(line)
+            if m:
+                latest_tile = int(m.group(1))
+                latest_total = int(m.group(2))
+        if not step_label:
+            for pat, label in STEP_PATTERNS:
+                if pat.search(line):
+                    step_label = label
+                    break
+        if step_label and latest_tile is not None:
+            break
+    if latest_tile is not None and latest_total is not None:
+        tile_info = f"Rendering tile {latest_tile} of {latest_total}"
+    return step_label, tile_info
+
+EEVEE_SAMPLE_RE = re.compile(r"Rendering\s+(\d+)\s*/\s*(\d+)\s+samples")
+SAVED_RE = re.compile(r"^\s*Saved: ")
+CHUNK_FRAMES_RE = re.compile(r"(\d+)(?:-(\d+))?$")
+FFMPEG_DURATION_RE = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+FFMPEG_PROGRESS_RE = re.compile(r"frame=\s*(\d+).*?time=\s*(\d+):(\d+):(\d+(?:\.\d+)?)(?:.*?speed=\s*([\d.]+)x)?")
+
+# Progress parsers keyed by (task type, task status). Tasks without a
+# parser, such as queued tasks or file-management commands, have nothing
+# to show, so their logs are never fetched.
+PROGRESS_PARSERS = {}
+
+def register_progress_parser(task_type, statuses=("active",)):
+    def decorator(fn):
+        for status in statuses:
+            PROGRESS_PARSERS[(task_type, status)] = fn
+        return fn
+    return decorator
+
+def get_progress_parser(task_type, status):
+    return PROGRESS_PARSERS.get((task_type, status))
+
+def parse_cycles_progress(lines, last_update):
+    step_label, tile_info = extract_render_step_and_tile(lines)
+    time_remaining = ""
+    # Use the *latest* progress numbers from the log
+    latest_cur, latest_total = 0, 0
+    for line in reversed(lines):
+        m = PROGRESS_RE.search(line)
+        if m:
+            latest_cur, latest_total = int(m.group(1)), int(m.group(2))
+            break
+    pct = int(latest_cur / latest_total * 100) if latest_total else 0
+    for lookback in range(0, 10):
+        idx = len(lines) - lookback - 1
+        if idx < 0:
+            break
+        tr = parse_time_remaining(lines[idx])
+        if tr:
+            time_remaining = tr
+            break
+    if latest_total:
+        return latest_cur, latest_total, pct, f"{latest_cur} / {latest_total}", last_update, step_label, tile_info, time_remaining
+    # If no progress, check for "Building BVH"
+    for line in reversed(lines):
+        m2 = BVH_RE.search(line)
+        if m2:
+            pct = int(m2.group(1))
+            return pct, 100, pct, f"{pct}%", last_update, "Building BVH", "", ""
+    for line in reversed(lines):
+        tr = parse_time_remaining(line)
+        if tr:
+            time_remaining = tr
+            break
+    return 0, 0, 0, "No progress", last_update, step_label, tile_info, time_remaining
+
+def parse_eevee_progress(lines, task_name, last_update):
+    # Blender render tasks are named after their frame chunk, e.g. "render-1-10"
+    n_frames = 1
+    m = CHUNK_FRAMES_RE.search(task_name or "")
+    if m and m.group(2):
+        n_frames = max(int(m.group(2)) - int(m.group(1)) + 1, 1)
+    frames_saved = 0
+    sample = None
+    for line in lines:
+        if SAVED_RE.match(line):
+            frames_saved += 1
+            sample = None
+            continue
+        m = EEVEE_SAMPLE_RE.search(line)
+        if m:
+            sample = int(m.group(1)), int(m.group(2))
+    if sample is None and not frames_saved:
+        return None
+    frames_saved = min(frames_saved, n_frames)
+    frame_fraction = sample[0] / sample[1] if sample and sample[1] else 0
+    pct = min(int((frames_saved + frame_fraction) / n_frames * 100), 100)
+    step_label = f"Rendering sample {sample[0]} of {sample[1]}" if sample else "Saving"
+    return frames_saved, n_frames, pct, f"{frames_saved} / {n_frames} frames", last_update, step_label, "", ""
+
+@register_progress_parser("blender")
+def parse_blender_log(data, task_name, last_update):
+    lines = data.decode("utf-8", errors="replace").splitlines()
+    result = parse_cycles_progress(lines, last_update)
+    if result[1]:
+        return result
+    return parse_eevee_progress(lines, task_name, last_update) or result
+
+@register_progress_parser("ffmpeg")
+def parse_ffmpeg_log(data, task_name, last_update):
+    # ffmpeg redraws its progress line with carriage returns; splitlines()
+    # splits on those as well.
+    lines = data.decode("utf-8", errors="replace").splitlines()
+    duration = None
+    for line in lines:
+        m = FFMPEG_DURATION_RE.search(line)
+        if m:
+            duration = int(m.group(1)) * 3600 + int(m.group(2)) * 60 + float(m.group(3))
+            break
+    for line in reversed(lines):
+        m = FFMPEG_PROGRESS_RE.search(line)
+        if not m:
+            continue
+        frame = int(m.group(1))
+        position = int(m.group(2)) * 3600 + int(m.group(3)) * 60 + float(m.group(4))
+        speed = float(m.group(5)) if m.group(5) else 0
+        time_remaining = ""
+        if duration and speed > 0:
+            remaining = max(duration - position, 0) / speed
+            time_remaining = f"{int(remaining // 60):02d}:{int(remaining % 60):02d}"
+        pct = min(int(position / duration * 100), 100) if duration else 0
+        return int(position), int(duration or 0), pct, f"frame {frame}", last_update, "Encoding video", "", time_remaining
+    return 0, 0, 0, "No progress", last_update, "", "", ""
+
+# Tokens found on more lines than this in one log (timestamps, "Fra", "Mem")
+# stop collecting positions there; queries scan that log instead.
+LOG_INDEX_MAX_LINES_PER_TOKEN = int(os.environ.get("LOG_INDEX_MAX_LINES_PER_TOKEN", 2000))
+TOKEN_RE = re.compile(rb"[A-Za-z][A-Za-z0-9_]+")
+
+def tokenize_log_file(path, start, stop):
+    """Tokenize the complete lines of path[start:stop]. Runs in a parse worker.
+
+    Returns (end, postings): the offset after the last complete line, and
+    token -> line start offsets, capped just past the per-token limit.
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(stop - start)
+    end = data.rfind(b"\n") + 1
+    postings = {}
+    line_start = 0
+    while line_start < end:
+        line_end = data.index(b"\n", line_start)
+        offset = start + line_start
+        for token in set(TOKEN_RE.findall(data, line_start, line_end)):
+            offsets = postings.setdefault(token.lower().decode("ascii"), [])
+            if len(offsets) <= LOG_INDEX_MAX_LINES_PER_TOKEN:
+                offsets.append(offset)
+        line_start = line_end + 1
+    return start + end, postings
+
+def parse_log_file(parser, path, task_name, last_update):
+    with open(path, "rb") as f:
+        data = f.read()
+    return parser(data, task_name, last_update)
+
+def make_thumbnail(data, max_size):
+    """Downscale an image to a JPEG at most max_size pixels on either side."""
+    if Image is None:
+        return data
+    with Image.open(io.BytesIO(data)) as img:
+        img.thumbnail((max_size, max_size))
+        out = io.BytesIO()
+        img.convert("RGB").save(out, "JPEG", quality=80, optimize=True)
+        return out.getvalue()
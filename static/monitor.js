@@ -0,0 +1,344 @@
+function updateFarmStatusBox(farmStatus) {
+    let colorClass = "status-yellow";
+    let label = farmStatus.charAt(0).toUpperCase() + farmStatus.slice(1);
+    if (farmStatus.toLowerCase() === "inoperative") {
+        colorClass = "status-red";
+    } else if (farmStatus.toLowerCase() === "idle") {
+        colorClass = "status-yellow";
+    } else if (farmStatus.toLowerCase() === "active") {
+        colorClass = "status-green";
+    } else if (farmStatus.toLowerCase() === "waiting") {
+        colorClass = "status-orange";
+    } else if (farmStatus.toLowerCase() === "unavailable") {
+        colorClass = "status-red";
+        label = "Unavailable";
+    }
+    document.getElementById("farm-status").innerHTML =
+      `Farm Status: <span class="${colorClass}">${label}</span>`;
+}
+updateFarmStatusBox(document.body.dataset.farmStatus);
+
+var taskSortingState = {};
+var completedDropdownState = {};
+var lastJobsData = [];
+var workersDropdownState = {};
+var lastCompletedJobs = [];
+
+function createProgressBar(pct, width=200, height=16) {
+    return `<div class="progress-bar-bg" style="width:${width}px;height:${height}px;">
+        <div class="progress-bar" style="width:${pct}%;"></div>
+    </div>`;
+}
+function getSortedClass(state, col) {
+    if (state.field !== col) return "";
+    return state.asc ? "sorted-asc" : "sorted-desc";
+}
+function sortTasks(tasks, state) {
+    if (!state || !state.field || state.field === "default") return tasks;
+    let key = state.field;
+    let asc = state.asc;
+    let cmp = (a, b) => {
+        if (key === "progress_pct") return (asc ? 1 : -1) * (a.progress_pct - b.progress_pct);
+        let av = (a[key] || "").toString().toLowerCase();
+        let bv = (b[key] || "").toString().toLowerCase();
+        if (av === bv) return 0;
+        return asc ? (av < bv ? -1 : 1) : (av > bv ? -1 : 1);
+    };
+    return [...tasks].sort(cmp);
+}
+function renderTaskRows(tasks, jobId, state) {
+    let sorted = sortTasks(tasks, state);
+    return sorted.map(function(task) {
+        return `<tr>
+            <td>${task.task_name}</td>
+            <td>${task.status}</td>
+            <td>
+                ${createProgressBar(task.progress_pct, 160, 14)}
+                <span class="progress-label">${task.progress_pct}%</span>
+                ${
+                    task.tile_info && task.tile_info !== "" ?
+                    `<span class="tile-label">${task.tile_info}</span>` : ""
+                }
+                ${
+                    task.step_label && task.step_label !== "" ?
+                    `<span class="step-label">${task.step_label}</span>` : ""
+                }
+                ${
+                    task.time_remaining && task.time_remaining !== "" ?
+                    `<span class="time-remaining-label">ETA:${task.time_remaining}</span>` : ""
+                }
+            </td>
+            <td>
+                <a class="log-link" href="${task.log_url}" target="_blank">Log File</a>
+            </td>
+        </tr>`;
+    }).join("");
+}
+function toggleTaskSorting(jobId, col) {
+    let state = taskSortingState[jobId] || {field: "default", asc: true};
+    if (state.field === col) {
+        state.asc = !state.asc;
+    } else {
+        state.field = col;
+        state.asc = true;
+    }
+    taskSortingState[jobId] = state;
+    let job = lastJobsData.find(j => j.job_id === jobId);
+    if (job) {
+        let tableBody = document.querySelector(`#task-table-${jobId} tbody`);
+        tableBody.innerHTML = renderTaskRows(job.tasks, jobId, state);
+    }
+    ['task_name', 'status', 'progress_pct', 'log_url'].forEach(colName => {
+        let th = document.getElementById(`th-${colName}-${jobId}`);
+        if (th) th.className = getSortedClass(state, colName);
+    });
+}
+function renderJobs(jobs) {
+    lastJobsData = jobs;
+    let html = '';
+    jobs.forEach(function(job) {
+        html += `<div class="job-block">
+            <div style="margin-bottom:9px;">
+                <b style="font-size:1.1em;">${job.job_name}</b>
+                <span style="font-size:0.97em;color:#9de0fd;">[${job.job_id}]</span>
+                <span style="font-size:0.93em;color:#ffd;"> (${job.n_tasks_completed}/${job.n_tasks} tasks completed)</span>
+            </div>
+            <div class="job-progress-row">
+                ${createProgressBar(job.job_progress_pct, 380, 28)}
+                <span class="progress-label">${job.job_progress_pct}%</span>
+                ${job.preview_url ? `<a href="${job.preview_url}" target="_blank"><img class="job-preview" src="${job.preview_url}" alt="Last rendered frame"></a>` : ''}
+            </div>
+            <table class="task-table" id="task-table-${job.job_id}">
+                <thead>
+                    <tr>
+                        <th id="th-task_name-${job.job_id}" onclick="toggleTaskSorting('${job.job_id}','task_name')">Task Name</th>
+                        <th id="th-status-${job.job_id}" onclick="toggleTaskSorting('${job.job_id}','status')">Status</th>
+                        <th id="th-progress_pct-${job.job_id}" onclick="toggleTaskSorting('${job.job_id}','progress_pct')">Render Progress</th>
+                        <th id="th-log_url-${job.job_id}" onclick="toggleTaskSorting('${job.job_id}','log_url')">Log File</th>
+                    </tr>
+                </thead>
+                <tbody>
+                    ${renderTaskRows(job.tasks, job.job_id, taskSortingState[job.job_id])}
+                </tbody>
+            </table>
+        </div>`;
+    });
+    document.getElementById("jobs-list").innerHTML = html;
+}
+
+// Modal popup for completed jobs
+function renderCompletedJobs(jobs) {
+    lastCompletedJobs = jobs;
+    let html = '';
+    jobs.forEach(function(job, idx) {
+        html += `
+            <div class="completed-job-list-item" onclick="showCompletedJobModal(${idx})">
+                <span>
+                    <span class="completed-job-list-name">${job.job_name}</span>
+                    <span class="completed-job-list-id">[${job.job_id}]</span>
+                </span>
+                <span>
+                    <span class="completed-job-list-status">${job.job_status || ''}</span>
+                    <span class="completed-job-list-time">${job.completed_time ? 'Completed: ' + job.completed_time : ''}</span>
+                </span>
+            </div>
+        `;
+    });
+    document.getElementById("completed-jobs-list").innerHTML = html;
+}
+
+function renderCompletedTaskRows(tasks) {
+    return tasks.map(function(task) {
+        return `<tr>
+            <td>${task.task_name}</td>
+            <td>${task.status}</td>
+            <td>
+                ${createProgressBar(task.progress_pct, 160, 14)}
+                <span class="progress-label">${task.progress_pct}%</span>
+                ${
+                    task.tile_info && task.tile_info !== "" ?
+                    `<span class="tile-label">${task.tile_info}</span>` : ""
+                }
+                ${
+                    task.step_label && task.step_label !== "" ?
+                    `<span class="step-label">${task.step_label}</span>` : ""
+                }
+                ${
+                    task.time_remaining && task.time_remaining !== "" ?
+                    `<span class="time-remaining-label">ETA:${task.time_remaining}</span>` : ""
+                }
+            </td>
+            <td>
+                <a class="log-link" href="${task.log_url}" target="_blank">Log File</a>
+            </td>
+        </tr>`;
+    }).join('');
+}
+
+var openCompletedJobId = null;
+function showCompletedJobModal(idx) {
+    var job = lastCompletedJobs[idx];
+    if (!job) return;
+    openCompletedJobId = job.job_id;
+    let modalContent = `
+        <div class="modal-job-header">
+            <span>${job.job_name}</span>
+            <span class="modal-job-id">[${job.job_id}]</span>
+            <span class="modal-job-status">${job.job_status || ''}</span>
+            <span class="modal-job-time">${job.completed_time ? 'Completed: ' + job.completed_time : ''}</span>
+        </div>
+        <div class="modal-tasks-label">Tasks</div>
+        <table class="completed-task-table">
+            <thead>
+                <tr>
+                    <th>Task Name</th>
+                    <th>Status</th>
+                    <th>Render Progress</th>
+                    <th>Log File</th>
+                </tr>
+            </thead>
+            <tbody id="completed-job-modal-tasks">
+                <tr><td colspan="4">Loading tasks&hellip;</td></tr>
+            </tbody>
+        </table>
+    `;
+    document.getElementById('completed-job-modal-content').innerHTML = modalContent;
+    document.getElementById('completed-job-modal-overlay').classList.add('active');
+    // Task tables of finished jobs are not part of the live stream;
+    // they are fetched only when someone opens the job.
+    fetch(`/api/jobs/${encodeURIComponent(job.job_id)}/tasks`)
+        .then(resp => resp.ok ? resp.json() : Promise.reject(resp.status))
+        .then(function(data) {
+            if (openCompletedJobId !== job.job_id) return;
+            document.getElementById('completed-job-modal-tasks').innerHTML =
+                renderCompletedTaskRows(data.tasks || []);
+        })
+        .catch(function() {
+            if (openCompletedJobId !== job.job_id) return;
+            document.getElementById('completed-job-modal-tasks').innerHTML =
+                '<tr><td colspan="4">Could not load tasks</td></tr>';
+        });
+}
+window.showCompletedJobModal = showCompletedJobModal;
+
+function closeCompletedJobModal(event) {
+    openCompletedJobId = null;
+    document.getElementById('completed-job-modal-overlay').classList.remove('active');
+}
+window.closeCompletedJobModal = closeCompletedJobModal;
+
+// LOG SEARCH
+function escapeHtml(text) {
+    return text.replace(/[&<>"']/g, c => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c]));
+}
+function searchLogs(event) {
+    event.preventDefault();
+    let query = document.getElementById('log-search-input').value.trim();
+    let box = document.getElementById('search-results');
+    if (!query) {
+        box.innerHTML = '';
+        return;
+    }
+    fetch('/api/search?q=' + encodeURIComponent(query))
+        .then(resp => resp.json())
+        .then(function(data) {
+            let html = `<div class="search-summary">${data.results.length} matching lines across ${data.indexed_logs} indexed logs (${data.elapsed_ms} ms)</div>`;
+            data.results.forEach(function(result) {
+                html += `<div class="search-result">
+                    <a class="log-link" href="${result.log_url}" target="_blank">[${result.job_id}] task ${result.task_id}</a>
+                    <div class="search-result-line">${escapeHtml(result.line)}</div>
+                </div>`;
+            });
+            box.innerHTML = html;
+        });
+}
+window.searchLogs = searchLogs;
+
+function setCompletedLimit(limit) {
+    fetch('/api/completed-jobs/limit', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({limit: parseInt(limit, 10)})
+    });
+}
+window.setCompletedLimit = setCompletedLimit;
+function updateCompletedLimit(limit) {
+    let select = document.getElementById('completed-limit');
+    if (!limit || document.activeElement === select) return;
+    if (![...select.options].some(o => o.value == limit)) {
+        select.add(new Option(limit, limit));
+    }
+    select.value = limit;
+}
+
+// WORKERS PANEL LOGIC
+function formatDuration(seconds) {
+    if (seconds === null || seconds === undefined) return '-';
+    let s = Math.round(seconds);
+    let h = Math.floor(s / 3600), m = Math.floor((s % 3600) / 60);
+    s = s % 60;
+    return (h ? h + 'h ' : '') + (h || m ? m + 'm ' : '') + s + 's';
+}
+function renderWorkers(workers) {
+    let html = '';
+    workers.forEach(function(worker, idx) {
+        let dropdownId = 'worker-dropdown-' + idx;
+        let isOpen = workersDropdownState[dropdownId] || false;
+        let perf = worker.perf || {};
+        let tilesPerSec = perf.tiles_per_sec !== null && perf.tiles_per_sec !== undefined ? perf.tiles_per_sec.toFixed(2) : '-';
+        let failureRate = perf.failure_rate !== null && perf.failure_rate !== undefined ? (perf.failure_rate * 100).toFixed(1) + '%' : '-';
+        let perfClass = perf.failure_rate > 0.2 ? 'worker-perf flaky' : 'worker-perf';
+        html += `<div class="worker-entry">
+            <div class="worker-header" onclick="toggleWorkerDropdown('${dropdownId}')">
+                <span class="worker-toggle-arrow" id="worker-arrow-${dropdownId}">${isOpen ? '▼' : '►'}</span>
+                <span class="worker-name">${worker.name || '(Unnamed)'}</span>
+                <span class="worker-status ${worker.status.toLowerCase()}">${worker.status}</span>
+                <span class="worker-version">v${worker.version || '-'}</span>
+                <span class="${perfClass}">${tilesPerSec} t/s</span>
+            </div>
+            <div class="worker-details" id="${dropdownId}" style="display:${isOpen ? 'block' : 'none'};">
+                <div class="worker-details-row"><b>ID:</b> <span>${worker.id}</span></div>
+                <div class="worker-details-row"><b>Status:</b> <span>${worker.status}</span></div>
+                <div class="worker-details-row"><b>Version:</b> <span>${worker.version}</span></div>
+                <div class="worker-details-row"><b>Can Restart:</b> <span>${worker.can_restart}</span></div>
+                <div class="worker-details-row"><b>Last Seen:</b> <span>${worker.last_seen}</span></div>
+                <div class="worker-details-row"><b>Tiles/sec:</b> <span>${tilesPerSec}</span></div>
+                <div class="worker-details-row"><b>Median Task:</b> <span>${formatDuration(perf.median_task_duration)}</span></div>
+                <div class="worker-details-row"><b>Failure Rate:</b> <span>${failureRate} (${perf.tasks_sampled || 0} tasks)</span></div>
+            </div>
+        </div>`;
+    });
+    document.getElementById("workers-list").innerHTML = html;
+}
+function toggleWorkerDropdown(dropdownId) {
+    workersDropdownState[dropdownId] = !workersDropdownState[dropdownId];
+    let el = document.getElementById(dropdownId);
+    let arrow = document.getElementById("worker-arrow-" + dropdownId);
+    if (el && arrow) {
+        el.style.display = workersDropdownState[dropdownId] ? 'block' : 'none';
+        arrow.innerHTML = workersDropdownState[dropdownId] ? '▼' : '►';
+    }
+}
+window.toggleWorkerDropdown = toggleWorkerDropdown;
+
+// Updates arrive as UTF-8 JSON bytes, encoded once for all clients.
+// Acking one tells the server this client is ready for the next.
+var HIDDEN_UPDATE_INTERVAL = 15;
+var utf8 = new TextDecoder();
+var socket = io();
+function reportVisibility() {
+    socket.emit('set_update_interval', {interval: document.hidden ? HIDDEN_UPDATE_INTERVAL : 0});
+}
+document.addEventListener('visibilitychange', reportVisibility);
+socket.on('connect', reportVisibility);
+socket.on('progress_update', function(payload, ack) {
+    let data = JSON.parse(utf8.decode(payload));
+    renderJobs(data.jobs || []);
+    renderCompletedJobs(data.completed_jobs || []);
+    updateCompletedLimit(data.completed_jobs_limit);
+    renderWorkers(data.workers || []);
+    if (data.farm_status) {
+        updateFarmStatusBox(data.farm_status);
+    }
+    if (ack) ack();
+});